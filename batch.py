@@ -0,0 +1,88 @@
+"""Bulk translation: fan a list of phrases out over a bounded thread pool.
+
+Usage from Python::
+
+    from batch import translate_batch
+    rows = translate_batch(["Hello", "Thank you"], target="de")
+
+Each worker goes through the shared translation cache first, so repeated
+phrases cost nothing. Upstream calls run at batch priority in the shared
+scheduler: they wait for the provider's rate limit, leave headroom for
+interactive users and stop short of the daily quota.
+"""
+
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+import scheduler
+import settings
+import translator
+
+
+class BatchResult(NamedTuple):
+    index: int          # position in the input list
+    text: str
+    translation: str
+
+
+# ---------- Input parsing ----------
+def parse_phrases(data: str, filename: str = "") -> List[str]:
+    # .csv: first non-empty cell of each row; anything else: one phrase per line
+    if filename.lower().endswith(".csv"):
+        rows = (next((cell for cell in row if cell.strip()), "") for row in csv.reader(io.StringIO(data)))
+    else:
+        rows = data.splitlines()
+    phrases = [row.strip() for row in rows]
+    return [p for p in phrases if p]
+
+
+# ---------- Translation ----------
+def _translate_one(text: str, target: str, provider: Optional[str]) -> str:
+    return translator.translate(text, target, provider, priority=scheduler.BATCH)
+
+
+def iter_translate_batch(phrases: Iterable[str], target: str = "de", provider: Optional[str] = None,
+                         max_workers: int = settings.BATCH_MAX_WORKERS) -> Iterator[BatchResult]:
+    # Yields results in completion order; duplicate phrases are translated once.
+    # provider None: the configured providers (LINGO_TRANSLATE_PROVIDERS), tried in order
+    phrases = list(phrases)[:settings.BATCH_MAX_ITEMS]
+    positions = {}
+    for idx, text in enumerate(phrases):
+        positions.setdefault(text.strip(), []).append(idx)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="batch") as pool:
+        futures = {pool.submit(_translate_one, text, target, provider): text for text in positions}
+        try:
+            for future in as_completed(futures):
+                text = futures[future]
+                translation = future.result()
+                for idx in positions[text]:
+                    yield BatchResult(idx, phrases[idx], translation)
+        finally:
+            # Caller stopped early: don't start the rest of the queue
+            for future in futures:
+                future.cancel()
+
+
+def translate_batch(phrases: Iterable[str], target: str = "de", provider: Optional[str] = None,
+                    max_workers: int = settings.BATCH_MAX_WORKERS,
+                    on_result: Optional[Callable[[BatchResult, int], None]] = None) -> List[BatchResult]:
+    # Blocking variant; `on_result(result, done_count)` is called as results arrive
+    results = []
+    for result in iter_translate_batch(phrases, target, provider, max_workers):
+        results.append(result)
+        if on_result is not None:
+            on_result(result, len(results))
+    results.sort(key=lambda r: r.index)
+    return results
+
+
+def results_to_csv(results: Iterable[BatchResult], target: str = "de") -> str:
+    source_col, target_col = ("en", "de") if target == "de" else ("de", "en")
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow([source_col, target_col])
+    for r in results:
+        writer.writerow([r.text, r.translation])
+    return buf.getvalue()
@@ -0,0 +1,139 @@
+"""Bounded per-session chat history.
+
+Turns are kept in a ring buffer (``deque(maxlen=...)``), so memory per
+session is capped no matter how long the conversation runs. When a spill
+file is configured, turns pushed out of the buffer are appended to it as
+JSON lines and can be paged back in with ``earlier()``. The file is deleted
+by ``clear()`` and when the history itself is garbage-collected (its session
+was dropped); files left behind by a crash or restart are swept once they
+have been idle for LINGO_CHAT_SPILL_MAX_AGE_S.
+"""
+
+import json
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+import settings
+
+USER, BOT = "user", "bot"
+SWEEP_EVERY = 600   # seconds between sweeps of a spill directory
+
+
+class Turn(NamedTuple):
+    role: str       # USER or BOT
+    text: str
+    ts: float
+
+
+def _tail_lines(path: Path, skip: int, count: int, block: int = 8192) -> List[str]:
+    # Lines [-(skip + count), -skip) of a file, reading backwards only as far as needed
+    want = skip + count
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= want:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode("utf-8", errors="replace").splitlines()   # a cut first line is never returned
+    lines = lines[-want:] if want else []
+    return lines[:len(lines) - skip] if skip else lines
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+_last_sweep = {}    # spill directory -> monotonic time of its last sweep
+_sweep_lock = threading.Lock()
+
+
+def sweep_spill_dir(directory: Path, max_age: float = settings.CHAT_SPILL_MAX_AGE_S, force: bool = False) -> int:
+    # Deletes spill files not written for max_age seconds; at most once per SWEEP_EVERY unless forced
+    now = time.monotonic()
+    with _sweep_lock:
+        if not force and now - _last_sweep.get(directory, -SWEEP_EVERY) < SWEEP_EVERY:
+            return 0
+        _last_sweep[directory] = now
+    cutoff, removed = time.time() - max_age, 0
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.name.endswith(".jsonl") and entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+class ChatHistory:
+    def __init__(self, max_turns: int = settings.CHAT_MAX_TURNS, spill_path: Optional[Path] = None):
+        self._turns: "deque[Turn]" = deque(maxlen=max_turns)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.spilled = 0    # turns moved to the spill file (or dropped when there is none)
+        if self.spill_path is not None:
+            weakref.finalize(self, _unlink, self.spill_path)
+            sweep_spill_dir(self.spill_path.parent)
+
+    def append(self, role: str, text: str) -> None:
+        if len(self._turns) == self._turns.maxlen:
+            oldest = self._turns[0]
+            if self.spill_path is not None:
+                if not self.spill_path.exists():
+                    self.spilled = 0        # swept while idle; those turns are gone
+                    self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(oldest._asdict(), ensure_ascii=False) + "\n")
+            self.spilled += 1
+        self._turns.append(Turn(role, text, time.time()))
+
+    def add_exchange(self, user_text: str, bot_text: str) -> None:
+        self.append(USER, user_text)
+        self.append(BOT, bot_text)
+
+    def recent(self, n: int) -> List[Turn]:
+        # Last n in-memory turns, oldest first
+        if n >= len(self._turns):
+            return list(self._turns)
+        return [self._turns[i] for i in range(len(self._turns) - n, len(self._turns))]
+
+    def earlier(self, skip: int, n: int) -> List[Turn]:
+        # Spilled turns older than the in-memory buffer; `skip` counts back from the newest spilled turn
+        if self.spill_path is None or not self.spill_path.exists() or skip >= self.spilled:
+            return []
+        lines = _tail_lines(self.spill_path, skip, min(n, self.spilled - skip))
+        return [Turn(**json.loads(line)) for line in lines]
+
+    def window(self, n: int) -> List[Turn]:
+        # Last n turns overall, reaching into the spill file when n exceeds the buffer
+        in_memory = self.recent(n)
+        missing = n - len(in_memory)
+        return (self.earlier(0, missing) if missing > 0 else []) + in_memory
+
+    def total(self) -> int:
+        # Turns that can still be shown (spilled + in memory)
+        kept = self.spilled if self.spill_path is not None else 0
+        return kept + len(self._turns)
+
+    def clear(self) -> None:
+        self._turns.clear()
+        self.spilled = 0
+        if self.spill_path is not None:
+            _unlink(self.spill_path)
+
+    def __len__(self) -> int:
+        return len(self._turns)
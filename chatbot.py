@@ -0,0 +1,129 @@
+"""Rule-based German chatbot.
+
+Intents live in chat_intents.json. All keywords are compiled once into a
+single word-level trie automaton with explicit priorities, so matching a
+message costs one short walk per word (bounded by the longest keyword
+phrase) no matter how many intents there are. Keywords only match whole
+words ("hi" no longer fires inside "Geschichte"); a trailing ``*`` marks a
+stem that may be followed by more letters ("woher komm*" -> "woher kommst").
+"""
+
+import json
+import random
+import re
+import threading
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+import metrics
+import settings
+from textnorm import fold
+
+
+class Intent(NamedTuple):
+    name: str
+    priority: int        # lower wins
+    response: str
+
+
+_END = ""       # node key: intents whose keyword ends at this node
+_STEMS = "*"    # node key: {first STEM_KEY chars: [(stem, intent), ...]} for stem keywords
+STEM_KEY = 3    # tokens never equal "" or "*", so the keys can't clash
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> List[str]:
+    # Same normalization for keywords and messages: case, apostrophes, umlauts, punctuation
+    return _WORD_RE.findall(fold(text).replace("'", ""))
+
+
+class IntentMatcher:
+    def __init__(self, intents: List[dict], default_responses: dict):
+        self.default_responses = default_responses
+        self.root = {}
+        self.max_depth = 0      # longest keyword in words
+        for spec in intents:
+            intent = Intent(spec["name"], spec["priority"], spec["response"])
+            for raw in spec["keywords"]:
+                self._add(raw, intent)
+
+    def _add(self, keyword: str, intent: Intent) -> None:
+        tokens = _tokens(keyword.rstrip("*"))
+        if not tokens:
+            return
+        node = self.root
+        for tok in tokens[:-1]:
+            node = node.setdefault(tok, {})
+        last = tokens[-1]
+        if keyword.endswith("*"):
+            if len(last) < STEM_KEY:
+                raise ValueError(f"stem keyword {keyword!r} needs at least {STEM_KEY} letters")
+            node.setdefault(_STEMS, {}).setdefault(last[:STEM_KEY], []).append((last, intent))
+        else:
+            node.setdefault(last, {}).setdefault(_END, []).append(intent)
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    def match(self, message: str) -> Optional[Intent]:
+        # Walk the trie from every word; each walk is at most max_depth steps
+        tokens = _tokens(message)
+        root, root_stems = self.root, self.root.get(_STEMS, {})
+        best: Optional[Intent] = None
+        for i, first in enumerate(tokens):
+            if first not in root and first[:STEM_KEY] not in root_stems:
+                continue    # no keyword starts with this word
+            node = root
+            for tok in tokens[i:i + self.max_depth]:
+                stems = node.get(_STEMS)
+                if stems is not None:
+                    for stem, intent in stems.get(tok[:STEM_KEY], ()):
+                        if tok.startswith(stem) and (best is None or intent.priority < best.priority):
+                            best = intent
+                node = node.get(tok)
+                if node is None:
+                    break
+                for intent in node.get(_END, ()):
+                    if best is None or intent.priority < best.priority:
+                        best = intent
+        return best
+
+    def default_response(self, message: str) -> str:
+        # Default responses based on input length
+        word_count = len(message.split())
+        if word_count <= 2:
+            responses = self.default_responses["short"]
+        elif word_count <= 5:
+            responses = self.default_responses["medium"]
+        else:
+            responses = self.default_responses["long"]
+        return random.choice(responses)
+
+    def respond(self, message: str) -> str:
+        with metrics.span("chatbot_match"):
+            intent = self.match(message)
+        metrics.inc(metrics.CHAT_RESPONSES, intent=intent.name if intent is not None else "default")
+        return intent.response if intent is not None else self.default_response(message)
+
+
+def load_matcher(path: Path = settings.CHAT_INTENTS_FILE) -> IntentMatcher:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return IntentMatcher(data["intents"], data["default_responses"])
+
+
+_matcher: Optional[IntentMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> IntentMatcher:
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = load_matcher()
+    return _matcher
+
+
+def get_german_response(user_input: str) -> str:
+    return get_matcher().respond(user_input)
@@ -0,0 +1,237 @@
+"""Process-wide content repository for lessons and quizzes.
+
+Content comes either from the two JSON files or, with LINGO_CONTENT_PACK,
+from a content pack built by tools/build_content_pack.py:
+
+    manifest.json           catalog (id, title, size) of every lesson and quiz
+    lessons-<build>-NNNN.jsonl, quizzes-<build>-NNNN.jsonl
+                            one record per line, in shards
+    lessons-<build>.idx, quizzes-<build>.idx
+                            sorted fixed-width (id, shard, offset, length) records
+
+A pack's index and shards are memory-mapped and a lesson body is parsed only
+when something asks for that lesson id (a small LRU keeps the recent ones),
+so memory and page cost follow what is shown, not the size of the catalog.
+
+Either way, content is loaded once per process and re-read only when the
+files change (the JSON files' or the manifest's mtime/size). Every page
+reads the same immutable snapshot and its prebuilt catalog indexes.
+"""
+
+import functools
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+import metrics
+import settings
+
+PACK_FORMAT = 1
+MANIFEST = "manifest.json"
+INDEX_RECORD = struct.Struct("<qIQI")      # record id, shard number, byte offset, byte length
+GENERATED_QUIZ_BASE = 1_000_000            # quiz ids above this: quizgen's practice quiz for lesson (id - base)
+
+
+class CatalogEntry(NamedTuple):
+    id: int
+    title: str
+    size: int           # lesson items / quiz questions
+
+
+# ---------- Lazy records ----------
+class RecordMap(Mapping):
+    # Read-only id -> record mapping whose bodies are loaded on access
+    def __init__(self, ids: List[int], load: Callable[[int], Optional[dict]]):
+        self._ids = ids
+        self._id_set = frozenset(ids)
+        self._load = load
+
+    def __getitem__(self, record_id: int) -> dict:
+        record = self._load(record_id) if record_id in self._id_set else None
+        if record is None:
+            raise KeyError(record_id)
+        return record
+
+    def __contains__(self, record_id) -> bool:
+        return record_id in self._id_set
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class ShardedRecords:
+    # One record kind (lessons or quizzes) of a content pack
+    def __init__(self, root: Path, spec: dict):
+        self._shards = [self._map(root / name) for name in spec["shards"]]
+        self._index = self._map(root / spec["index"])
+        self.count = len(self._index) // INDEX_RECORD.size
+        self.get = functools.lru_cache(maxsize=settings.CONTENT_CACHE_RECORDS)(self._read)
+
+    @staticmethod
+    def _map(path: Path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""      # an empty file can't be mapped
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _locate(self, record_id: int) -> Optional[Tuple[int, int, int]]:
+        # Binary search over the mapped index
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            found, shard, offset, length = INDEX_RECORD.unpack_from(self._index, mid * INDEX_RECORD.size)
+            if found < record_id:
+                lo = mid + 1
+            elif found > record_id:
+                hi = mid
+            else:
+                return shard, offset, length
+        return None
+
+    def _read(self, record_id: int) -> Optional[dict]:
+        location = self._locate(record_id)
+        if location is None:
+            return None
+        shard, offset, length = location
+        return json.loads(self._shards[shard][offset:offset + length])
+
+    def __iter__(self) -> Iterator[dict]:
+        # Every record, shard by shard, bypassing the cache (no shared file position, so thread-safe)
+        for shard in self._shards:
+            start, size = 0, len(shard)
+            while start < size:
+                end = shard.find(b"\n", start)
+                if end == -1:
+                    end = size
+                line = shard[start:end]
+                start = end + 1
+                if line.strip():
+                    yield json.loads(line)
+
+
+# ---------- Snapshot ----------
+class ContentSnapshot:
+    def __init__(self, lesson_catalog: List[CatalogEntry], quiz_catalog: List[CatalogEntry],
+                 load_lesson: Callable[[int], Optional[dict]], load_quiz: Callable[[int], Optional[dict]],
+                 iter_lessons: Callable[[], Iterator[dict]], iter_quizzes: Callable[[], Iterator[dict]],
+                 version: str):
+        self.version = version                      # changes whenever the content changes
+        self.lesson_catalog = lesson_catalog        # in display order
+        self.quiz_catalog = quiz_catalog
+        self._iter_lessons = iter_lessons
+        self._iter_quizzes = iter_quizzes
+
+        lesson_ids = [entry.id for entry in lesson_catalog]
+        quiz_ids = [entry.id for entry in quiz_catalog]
+        self.lesson_by_id: Mapping[int, dict] = RecordMap(lesson_ids, load_lesson)
+        self.quiz_by_id: Mapping[int, dict] = RecordMap(quiz_ids, load_quiz)
+        self.lesson_ids: FrozenSet[int] = frozenset(lesson_ids)
+        self.quiz_ids: FrozenSet[int] = frozenset(quiz_ids)
+        self.lesson_titles: Dict[int, str] = {entry.id: entry.title for entry in lesson_catalog}
+        self.item_counts: Dict[int, int] = {entry.id: entry.size for entry in lesson_catalog}
+
+        # Selectbox labels and reverse lookups
+        self.lesson_labels: List[str] = [f"Lesson {e.id}: {e.title}" for e in lesson_catalog]
+        self.lesson_label_to_id: Dict[str, int] = dict(zip(self.lesson_labels, lesson_ids))
+        self.lesson_id_to_label: Dict[int, str] = {v: k for k, v in self.lesson_label_to_id.items()}
+        self.quiz_labels: List[str] = [f"{e.id}. {e.title}" for e in quiz_catalog]
+        self.quiz_label_to_id: Dict[str, int] = dict(zip(self.quiz_labels, quiz_ids))
+        self.quiz_id_to_label: Dict[int, str] = {v: k for k, v in self.quiz_label_to_id.items()}
+        self._lesson_position: Dict[int, int] = {lesson_id: i for i, lesson_id in enumerate(lesson_ids)}
+
+    def iter_lessons(self) -> Iterator[dict]:
+        # Every lesson body, in catalog order for JSON content and shard order for packs
+        return self._iter_lessons()
+
+    def iter_quizzes(self) -> Iterator[dict]:
+        return self._iter_quizzes()
+
+    @property
+    def lessons(self) -> List[dict]:
+        # Loads every lesson body; pages use the catalog and lesson_by_id instead
+        return list(self._iter_lessons())
+
+    def lesson_position(self, lesson_id: int) -> Optional[int]:
+        return self._lesson_position.get(lesson_id)
+
+    def lessons_page(self, start: int, stop: int) -> List[dict]:
+        # Bodies of the lessons at catalog positions [start, stop)
+        return [self.lesson_by_id[entry.id] for entry in self.lesson_catalog[start:stop]]
+
+
+def _snapshot_from_json(lessons: List[dict], quizzes: List[dict], version: str) -> ContentSnapshot:
+    lesson_by_id = {l["lesson_id"]: l for l in lessons}
+    quiz_by_id = {q["quiz_id"]: q for q in quizzes}
+    return ContentSnapshot(
+        [CatalogEntry(l["lesson_id"], l["title"], len(l.get("content", []))) for l in lessons],
+        [CatalogEntry(q["quiz_id"], q["title"], len(q.get("questions", []))) for q in quizzes],
+        lesson_by_id.get, quiz_by_id.get, lambda: iter(lessons), lambda: iter(quizzes), version,
+    )
+
+
+def _snapshot_from_pack(root: Path, version: str) -> ContentSnapshot:
+    with open(root / MANIFEST, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != PACK_FORMAT:
+        raise ValueError(f"{root}: unsupported content pack format {manifest.get('format')!r}")
+    lessons = ShardedRecords(root, manifest["lessons"])
+    quizzes = ShardedRecords(root, manifest["quizzes"])
+    return ContentSnapshot(
+        [CatalogEntry(*entry) for entry in manifest["lessons"]["catalog"]],
+        [CatalogEntry(*entry) for entry in manifest["quizzes"]["catalog"]],
+        lessons.get, quizzes.get, lessons.__iter__, quizzes.__iter__, f"{manifest.get('build', '')}-{version}",
+    )
+
+
+# ---------- Repository ----------
+class ContentRepository:
+    def __init__(self, lessons_file: Path = settings.LESSONS_FILE, quizzes_file: Path = settings.QUIZZES_FILE,
+                 pack_dir: Optional[Path] = settings.CONTENT_PACK_DIR):
+        self.lessons_file = Path(lessons_file)
+        self.quizzes_file = Path(quizzes_file)
+        self.pack_dir = Path(pack_dir) if pack_dir else None
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._stamp: Optional[Tuple] = None
+        self._lock = threading.Lock()
+
+    def _file_stamp(self) -> Tuple:
+        if self.pack_dir is not None:
+            # The converter writes the manifest last, so it alone tells when a pack changed
+            m = os.stat(self.pack_dir / MANIFEST)
+            return (m.st_mtime_ns, m.st_size)
+        a, b = os.stat(self.lessons_file), os.stat(self.quizzes_file)
+        return (a.st_mtime_ns, a.st_size, b.st_mtime_ns, b.st_size)
+
+    def snapshot(self) -> ContentSnapshot:
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return self._snapshot
+        with self._lock:
+            if stamp != self._stamp:
+                version = "-".join(str(x) for x in stamp)
+                with metrics.span("content_load"):
+                    if self.pack_dir is not None:
+                        # Readers of the previous snapshot keep their maps; they go with it
+                        self._snapshot = _snapshot_from_pack(self.pack_dir, version)
+                    else:
+                        with open(self.lessons_file, "r", encoding="utf-8") as f:
+                            lessons = json.load(f)
+                        with open(self.quizzes_file, "r", encoding="utf-8") as f:
+                            quizzes = json.load(f)["quizzes"]
+                        self._snapshot = _snapshot_from_json(lessons, quizzes, version)
+                self._stamp = stamp
+            return self._snapshot
+
+
+_repository = ContentRepository()
+
+
+def get_content() -> ContentSnapshot:
+    return _repository.snapshot()
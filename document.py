@@ -0,0 +1,207 @@
+"""Document translation for .txt/.md files, streamed sentence by sentence.
+
+Usage from Python::
+
+    from document import iter_lines, translate_stream
+    with open("notes.md", "rb") as f:
+        for piece in translate_stream(iter_lines(f), target="de"):
+            print(piece, end="")
+
+The input is read line by line and split into sentences on the fly, so the
+first sentence goes out before the rest of the file has been looked at.
+Sentences are translated on a small thread pool a bounded window ahead of
+the output and yielded strictly in order; nothing but that window is ever
+held. Each request stays under ``DOCUMENT_MAX_CHARS`` (longer sentences are
+cut at word boundaries), which keeps it within the providers' size limits.
+Markdown structure (headings, list markers, quotes, code blocks) is passed
+through untranslated; in plain text every line is kept as a line.
+"""
+
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import scheduler
+import settings
+import translator
+
+
+class Segment(NamedTuple):
+    prefix: str     # kept as is (markdown markers, indentation)
+    text: str       # translated; may be empty
+    suffix: str     # kept as is (the whitespace that followed)
+
+
+# ---------- Splitting ----------
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_BLOCK_PREFIX_RE = re.compile(r"^(\s*(?:#{1,6}\s+|[-*+]\s+|\d+[.)]\s+|>\s?)+)")
+# A sentence ends after . ! ? or … (plus closing quotes/brackets) followed by whitespace
+_SENTENCE_END_RE = re.compile(r"[.!?…]+[\"'”’»)\]]*(?=\s)")
+_WORD_WINDOW = 32     # characters looked back from a full stop for an abbreviation
+_ABBREVIATIONS = {"dr", "mr", "mrs", "ms", "prof", "st", "nr", "str", "ca", "bzw", "usw", "etc", "vs",
+                  "z.b", "d.h", "u.a", "e.g", "i.e", "a.m", "p.m", "evtl", "ggf", "inkl", "vgl"}
+
+
+def is_fence(line: str) -> bool:
+    # Opens or closes a markdown code block
+    return bool(_FENCE_RE.match(line))
+
+
+def iter_lines(binary: BinaryIO, encoding: str = "utf-8") -> Iterator[str]:
+    # Decoded lines of a binary file object (e.g. an upload), one at a time
+    for raw in binary:
+        yield raw.decode(encoding, errors="replace")
+
+
+def _is_abbreviation(text: str, stop: int) -> bool:
+    # "z.B.", "Dr." or an initial ("J. Smith") ending with the full stop at text[stop]
+    if text[stop] != ".":
+        return False
+    words = text[max(0, stop - _WORD_WINDOW):stop].split()      # no abbreviation is longer
+    word = words[-1].lstrip("(\"'„“»").lower() if words else ""
+    return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def _split_sentences(text: str, scan_from: int = 0) -> Tuple[List[str], str]:
+    # (finished sentences, unfinished tail); sentence ends are only looked for from `scan_from` on
+    sentences, start = [], 0
+    for m in _SENTENCE_END_RE.finditer(text, scan_from):
+        if len(m.group()) == 1 and _is_abbreviation(text, m.start()):
+            continue
+        sentence = text[start:m.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = m.end()
+    return sentences, text[start:].strip()
+
+
+def _split_long(sentence: str, limit: int) -> Iterator[str]:
+    # Word-boundary pieces of at most `limit` characters (a single longer word is cut),
+    # walked by offset so each piece costs only its own length
+    start, end = 0, len(sentence)
+    while end - start > limit:
+        cut = sentence.rfind(" ", start, start + limit + 1)
+        if cut <= start:
+            cut = start + limit
+        yield sentence[start:cut]
+        start = cut
+        while start < end and sentence[start].isspace():
+            start += 1
+    if start < end:
+        yield sentence[start:]
+
+
+def iter_segments(lines: Iterable[str], markdown: bool = True,
+                  limit: int = settings.DOCUMENT_MAX_CHARS) -> Iterator[Segment]:
+    # Markdown: lines of a paragraph are joined and blank lines end it; only
+    # the unfinished sentence at the end of a line is carried to the next one,
+    # and only the newly added text is scanned for sentence ends. The carry
+    # goes out in pieces once it reaches `limit`, so text without sentence
+    # punctuation costs linear time. Plain text: every line is a paragraph.
+    carry = ""
+    held: Optional[Segment] = None      # latest sentence; its suffix depends on what follows
+    in_code = False
+
+    def release(sentences: List[str], end: Optional[str] = None) -> Iterator[Segment]:
+        nonlocal held
+        for sentence in sentences:
+            for piece in _split_long(sentence, limit):
+                if held is not None:
+                    yield held
+                held = Segment("", piece, " ")
+        if end is not None and held is not None:
+            yield held._replace(suffix=end)
+            held = None
+
+    def flush() -> Iterator[Segment]:
+        # End of paragraph: the tail counts as a sentence and the last one ends the line
+        nonlocal carry
+        sentences, rest = _split_sentences(carry)
+        carry = ""
+        return release(sentences + [rest] if rest else sentences, end="\n")
+
+    for line in lines:
+        body = line.rstrip("\r\n")
+        if markdown and is_fence(body):
+            yield from flush()
+            in_code = not in_code
+            yield Segment(body + "\n", "", "")
+        elif in_code:
+            yield Segment(body + "\n", "", "")
+        elif not body.strip():
+            yield from flush()
+            yield Segment("", "", "\n")
+        elif markdown and _BLOCK_PREFIX_RE.match(body):
+            # Headings, list items and quotes are blocks of their own
+            yield from flush()
+            prefix = _BLOCK_PREFIX_RE.match(body).group(1)
+            carry = body[len(prefix):]
+            yield Segment(prefix, "", "")
+            yield from flush()
+        elif not markdown:
+            carry = body.strip()
+            yield from flush()
+        else:
+            scan_from = len(carry)      # everything before was scanned with the previous line
+            carry = f"{carry} {body.strip()}" if carry else body.strip()
+            sentences, carry = _split_sentences(carry + " ", scan_from)
+            yield from release(sentences)
+            if len(carry) >= limit:
+                # Every piece but the last goes out as soon as it is cut; the last is the new carry
+                pieces = _split_long(carry, limit)
+                carry = next(pieces)
+                for piece in pieces:
+                    yield from release([carry])
+                    carry = piece
+    yield from flush()
+
+
+# ---------- Translation ----------
+def _translate_segment(text: str, target: str) -> str:
+    translated = translator.translate(text, target, priority=scheduler.BATCH)
+    # A sentence no provider could translate is kept rather than replaced by the notice
+    return text if translated == translator.NOT_FOUND else translated
+
+
+def translate_segments(segments: Iterable[Segment], target: str = "de",
+                       max_workers: int = settings.DOCUMENT_MAX_WORKERS,
+                       window: int = settings.DOCUMENT_WINDOW) -> Iterator[str]:
+    # Output pieces in document order; at most `window` segments are in flight
+    pending: "deque[tuple]" = deque()
+    inflight: Dict[str, Future] = {}      # repeated sentences inside the window share one call
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="document") as pool:
+        try:
+            for segment in segments:
+                future = None
+                if segment.text:
+                    future = inflight.get(segment.text)
+                    if future is None:
+                        future = inflight[segment.text] = pool.submit(_translate_segment, segment.text, target)
+                pending.append((segment, future))
+                while len(pending) > window or (pending and _ready(pending[0][1])):
+                    yield _emit(pending.popleft(), inflight, pending)
+            while pending:
+                yield _emit(pending.popleft(), inflight, pending)
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+
+
+def _ready(future) -> bool:
+    return future is None or future.done()
+
+
+def _emit(item: tuple, inflight: Dict[str, Future], pending: "deque[tuple]") -> str:
+    segment, future = item
+    if future is None:
+        return segment.prefix + segment.suffix
+    translation = future.result()
+    if not any(f is future for _, f in pending):
+        inflight.pop(segment.text, None)
+    return segment.prefix + translation + segment.suffix
+
+
+def translate_stream(lines: Iterable[str], target: str = "de", markdown: bool = True) -> Iterator[str]:
+    return translate_segments(iter_segments(lines, markdown), target)
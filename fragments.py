@@ -0,0 +1,63 @@
+"""Fragment helpers: partial reruns for interactive page regions, plus the
+per-interaction timing used to compare them with full-script reruns.
+
+With LINGO_FRAGMENTS=0 every fragment becomes a plain function call, which
+gives the "before" numbers; LINGO_SHOW_TIMINGS=1 shows both in the sidebar.
+"""
+
+import functools
+import time
+from collections import deque
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+import settings
+
+TIMING_WINDOW = 50    # runs kept per region
+
+
+def record_timing(name: str, seconds: float) -> None:
+    timings = st.session_state.setdefault("_timings", {})
+    timings.setdefault(name, deque(maxlen=TIMING_WINDOW)).append(seconds)
+
+
+def fragment(func):
+    # st.fragment that also records how long each of its runs took
+    @functools.wraps(func)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_timing(f"fragment:{func.__name__}", time.perf_counter() - start)
+
+    return st.fragment(timed) if settings.USE_FRAGMENTS else timed
+
+
+def rerun_fragment() -> None:
+    # Rerun only the calling fragment. Outside a fragment rerun (fragments off,
+    # or the fragment is being drawn as part of a full run) rerun the app.
+    if settings.USE_FRAGMENTS:
+        try:
+            st.rerun(scope="fragment")
+        except StreamlitAPIException:
+            pass
+    st.rerun()
+
+
+def render_timings() -> None:
+    timings = st.session_state.get("_timings")
+    if not settings.SHOW_TIMINGS or not timings:
+        return
+    with st.sidebar.expander("⏱ Server time per run"):
+        st.caption("fragments on" if settings.USE_FRAGMENTS else "fragments off (full reruns)")
+        st.table([
+            {
+                "region": name,
+                "runs": len(runs),
+                "last ms": round(runs[-1] * 1000, 2),
+                "mean ms": round(sum(runs) / len(runs) * 1000, 2),
+            }
+            for name, runs in sorted(timings.items())
+        ])
@@ -0,0 +1,126 @@
+"""Bidirectional EN<->DE glossary compiled from the lesson content.
+
+Phrases are stored in a token trie per direction, so an input like
+"good morning thank you" is segmented by longest match ("good morning" +
+"thank you") and translated piecewise in a single left-to-right pass.
+"""
+
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from content import get_content
+from textnorm import normalize, tokenize
+
+# ---------- Local fallback dictionary ----------
+LOCAL_DICT = {
+    "hello": "hallo",
+    "good morning": "guten morgen",
+    "thank you": "danke",
+    "please": "bitte",
+    "goodbye": "auf wiedersehen",
+    "how are you?": "wie geht's?",
+    "i am fine": "mir geht es gut",
+    "see you soon": "bis bald",
+    "yes": "ja",
+    "no": "nein"
+}
+
+_VALUE = ""    # trie key holding a node's translation; never a real token
+
+
+class PhraseTrie:
+    def __init__(self):
+        self.root = {}
+        self.max_depth = 0
+
+    def add(self, phrase: str, translation: str) -> None:
+        tokens = [norm for norm, _ in tokenize(phrase)]
+        if not tokens:
+            return
+        node = self.root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node.setdefault(_VALUE, translation)       # first definition wins
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    def exact(self, tokens: List[str]) -> Optional[str]:
+        node = self.root
+        for tok in tokens:
+            node = node.get(tok)
+            if node is None:
+                return None
+        return node.get(_VALUE)
+
+    def segment(self, text: str) -> List[Tuple[str, Optional[str]]]:
+        # Greedy longest match: [(source surface text, translation or None), ...]
+        tokens = tokenize(text)
+        segments = []
+        i = 0
+        while i < len(tokens):
+            node, match_end, match = self.root, i, None
+            j = i
+            while j < len(tokens):
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                if _VALUE in node:
+                    match_end, match = j, node[_VALUE]
+            if match is None:
+                segments.append((tokens[i][1], None))
+                i += 1
+            else:
+                segments.append((" ".join(surface for _, surface in tokens[i:match_end]), match))
+                i = match_end
+        return segments
+
+
+class Glossary:
+    def __init__(self, pairs: Iterable[Tuple[str, str]]):
+        self.tries = {"de": PhraseTrie(), "en": PhraseTrie()}    # keyed by target language
+        self.size = 0
+        for en, de in pairs:
+            self.tries["de"].add(en, de)
+            self.tries["en"].add(de, en)
+            self.size += 1
+
+    def lookup(self, text: str, target: str = "de") -> Optional[str]:
+        # Whole input must be one known phrase
+        return self.tries[target].exact(normalize(text).split())
+
+    def translate(self, text: str, target: str = "de") -> Tuple[str, float]:
+        # Piecewise translation and the fraction of tokens covered by the glossary
+        segments = self.tries[target].segment(text)
+        if not segments:
+            return "", 0.0
+        covered = sum(len(src.split()) for src, tr in segments if tr is not None)
+        total = sum(len(src.split()) for src, _ in segments)
+        return " ".join(tr if tr is not None else src for src, tr in segments), covered / total
+
+
+def lesson_pairs(lessons: Iterable[dict]) -> Iterable[Tuple[str, str]]:
+    for lesson in lessons:
+        for item in lesson.get("content", []):
+            yield item["en"], item["de"]
+
+
+def build_glossary(lessons: Iterable[dict]) -> Glossary:
+    # Curated lesson pairs take precedence over the lowercase LOCAL_DICT entries
+    return Glossary(list(lesson_pairs(lessons)) + list(LOCAL_DICT.items()))
+
+
+_glossary: Optional[Glossary] = None
+_glossary_version: Optional[str] = None
+_glossary_lock = threading.Lock()
+
+
+def get_glossary() -> Glossary:
+    # Rebuilt only when the lesson content changes
+    global _glossary, _glossary_version
+    content = get_content()
+    if content.version != _glossary_version:
+        with _glossary_lock:
+            if content.version != _glossary_version:
+                _glossary = build_glossary(content.iter_lessons())
+                _glossary_version = content.version
+    return _glossary
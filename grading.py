@@ -0,0 +1,84 @@
+"""Grading of typed quiz answers.
+
+The typed text and every accepted answer are normalised with textnorm (case,
+umlauts/ß, apostrophe variants, punctuation), then compared by Levenshtein
+distance with a small allowance that grows with the answer's length, so
+"tschuss" and "Tschüs" both pass for "Tschüss" while "Tag" doesn't pass
+for "Tee".
+
+The distance is Myers' bit-parallel algorithm (in Hyyrö's formulation for
+edit distance): the answer's characters are bit positions of one Python
+int, and each typed character updates a whole column of the dynamic
+programming table with a handful of integer operations. A check costs
+O(len(typed)) integer operations whatever the answer's length, and stops
+early once the allowance can no longer be met, so grading every rerun of
+a long answer stays cheap.
+"""
+
+from typing import Dict, Iterable, NamedTuple
+
+from textnorm import normalize
+
+
+class Grade(NamedTuple):
+    correct: bool
+    exact: bool         # equal after normalisation, no typos
+    distance: int       # edits to the closest accepted answer (capped at its allowance + 1)
+    answer: str         # closest accepted answer, as written in the quiz
+
+
+def allowed_edits(length: int) -> int:
+    # Typos tolerated in an answer of `length` normalised characters
+    return 0 if length < 4 else 1 if length < 8 else 2 if length < 16 else length // 8
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    # Levenshtein distance between a and b; limit + 1 as soon as it must exceed `limit`
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > limit:
+        return limit + 1
+    m = len(a)
+    if m == 0:
+        return len(b)
+    peq: Dict[str, int] = {}        # character -> bit mask of its positions in a
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m      # vertical +1/-1 deltas of the current column; score = its last cell
+    remaining = len(b)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        remaining -= 1
+        if score - remaining > limit:
+            return limit + 1        # each remaining column lowers the score by at most one
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return min(score, limit + 1)
+
+
+def grade(typed: str, answer: str, accepted: Iterable[str] = ()) -> Grade:
+    # typed: the learner's text; answer and accepted: the spellings that count as right
+    given = normalize(typed)
+    best = None
+    for expected in [answer, *accepted]:
+        target = normalize(expected)
+        limit = allowed_edits(len(target))
+        distance = edit_distance(given, target, limit) if given else len(target) + 1
+        if distance == 0:
+            return Grade(True, True, 0, expected)
+        if best is None or distance - limit < best[0] - best[1]:
+            best = (distance, limit, expected)
+    distance, limit, expected = best
+    return Grade(bool(given) and distance <= limit, False, distance, expected)
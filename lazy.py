@@ -0,0 +1,37 @@
+"""Deferred module imports.
+
+``lazy_import("batch")`` returns a stand-in that imports the real module on
+first attribute access, so a page can name its heavy dependencies at the top
+without paying for them until an interaction actually needs them.
+"""
+
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            # importlib's per-module lock makes concurrent first uses safe
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
@@ -0,0 +1,149 @@
+"""Offline EN<->DE translation with MarianMT-style seq2seq models on CPU.
+
+Expected layout (e.g. Helsinki-NLP/opus-mt-en-de and opus-mt-de-en saved
+with ``save_pretrained``)::
+
+    $LINGO_LOCAL_MODEL_DIR/en-de/
+    $LINGO_LOCAL_MODEL_DIR/de-en/
+
+torch/transformers are only imported when a model is first used. Requests
+from concurrent sessions are gathered into micro-batches by one worker
+thread per direction, so N simultaneous users cost one ``generate`` call.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional
+
+import providers
+import settings
+from providers import ProviderError
+
+
+class MarianEngine:
+    def __init__(self, model_dir: Path, quantize: bool = settings.LOCAL_MODEL_QUANTIZE,
+                 num_threads: int = settings.LOCAL_MODEL_THREADS,
+                 max_batch_size: int = settings.LOCAL_MODEL_MAX_BATCH,
+                 max_wait_ms: float = settings.LOCAL_MODEL_MAX_WAIT_MS,
+                 max_new_tokens: int = settings.LOCAL_MODEL_MAX_NEW_TOKENS):
+        self.model_dir = Path(model_dir)
+        self.quantize = quantize
+        self.num_threads = num_threads
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_new_tokens = max_new_tokens
+        self.model = None
+        self.tokenizer = None
+        self._load_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    # ---------- Loading ----------
+    def load(self) -> None:
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is not None:
+                return
+            import torch
+            from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+            if self.num_threads > 0:
+                torch.set_num_threads(self.num_threads)
+            tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir), local_files_only=True)
+            model = AutoModelForSeq2SeqLM.from_pretrained(str(self.model_dir), local_files_only=True)
+            model.eval()
+            if self.quantize:
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.tokenizer = tokenizer
+            self.model = model
+            self._worker = threading.Thread(target=self._run, name=f"marian-{self.model_dir.name}", daemon=True)
+            self._worker.start()
+
+    # ---------- Inference ----------
+    def translate_many(self, texts: List[str]) -> List[str]:
+        # One padded generate() call for the whole list
+        import torch
+
+        self.load()
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+        with torch.inference_mode():
+            output = self.model.generate(**inputs, max_new_tokens=self.max_new_tokens, num_beams=1)
+        return self.tokenizer.batch_decode(output, skip_special_tokens=True)
+
+    def translate(self, text: str, timeout: Optional[float] = None) -> str:
+        # Queue the text for the next micro-batch and wait for its result
+        self.load()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                outputs = self.translate_many([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), output in zip(batch, outputs):
+                    future.set_result(output)
+
+
+class LocalTranslator:
+    DIRECTIONS = {"de": "en-de", "en": "de-en"}   # target language -> model subdirectory
+
+    def __init__(self, model_root: Path, **engine_kwargs):
+        self.model_root = Path(model_root)
+        self.engines = {
+            target: MarianEngine(self.model_root / subdir, **engine_kwargs)
+            for target, subdir in self.DIRECTIONS.items()
+            if (self.model_root / subdir).is_dir()
+        }
+
+    def translate(self, text: str, target: str = "de") -> str:
+        # Same contract as the remote providers: a string or ProviderError
+        engine = self.engines.get(target)
+        if engine is None:
+            raise ProviderError(f"no local model for target '{target}' in {self.model_root}")
+        try:
+            translated = engine.translate(text)
+        except Exception as e:
+            raise ProviderError(f"local model failed: {e}") from e
+        if not translated:
+            raise ProviderError("local model returned no translation")
+        return translated
+
+
+_local: Optional[LocalTranslator] = None
+_local_lock = threading.Lock()
+
+
+def get_local_translator() -> Optional[LocalTranslator]:
+    # One per process when LINGO_LOCAL_MODEL_DIR is set; the models load on first use
+    global _local
+    if _local is None and settings.LOCAL_MODEL_DIR:
+        with _local_lock:
+            if _local is None:
+                _local = LocalTranslator(settings.LOCAL_MODEL_DIR)
+    return _local
+
+
+def register_provider() -> None:
+    # Make the local model available to translator.translate() as "local"
+    local = get_local_translator()
+    if local is not None:
+        providers.PROVIDERS.setdefault("local", local.translate)
@@ -0,0 +1,260 @@
+"""In-process instrumentation: counters, latency histograms and timing spans.
+
+Everything is off unless LINGO_METRICS=1 (or a JSON log is configured); then
+``span()`` hands back one shared no-op context manager and ``inc()`` returns
+straight away, so the hot paths pay a function call and a flag check.
+
+When enabled, metrics are exposed in the Prometheus text format through any
+of: a text file rewritten every few seconds (LINGO_METRICS_FILE, for the
+node_exporter textfile collector), an HTTP ``/metrics`` endpoint
+(LINGO_METRICS_PORT) or ``render_prometheus()``. LINGO_METRICS_LOG adds one
+JSON line per span and per error event, to a file or ``-`` for stderr.
+"""
+
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import settings
+
+# Seconds; wide enough for glossary hits (~µs) and provider timeouts alike
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+enabled = settings.METRICS or bool(settings.METRICS_LOG)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# ---------- Metric types ----------
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[Tuple[str, Labels, float]]:
+        with self._lock:
+            items = list(self.values.items())
+        for key, value in items:
+            yield self.name, key, value
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.values: Dict[Labels, list] = {}     # labels -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self.values.get(key)
+            if row is None:
+                row = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[i] += 1
+            row[-1] += value
+
+    def samples(self) -> Iterable[Tuple[str, Labels, float]]:
+        with self._lock:
+            items = [(key, list(row)) for key, row in self.values.items()]
+        for key, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                yield f"{self.name}_bucket", key + (("le", repr(float(bound))),), cumulative
+            cumulative += row[len(self.buckets)]
+            yield f"{self.name}_bucket", key + (("le", "+Inf"),), cumulative
+            yield f"{self.name}_sum", key, row[-1]
+            yield f"{self.name}_count", key, cumulative
+
+
+# ---------- Registry ----------
+SPAN_SECONDS = Histogram("lingo_span_seconds", "Duration of instrumented operations.")
+PROVIDER_CALLS = Counter("lingo_provider_calls_total", "Translation provider calls by outcome.")
+PROVIDER_ERRORS = Counter("lingo_provider_errors_total", "Translation provider errors by exception type.")
+TRANSLATIONS = Counter("lingo_translations_total", "Translations by the pipeline stage that answered.")
+CHAT_RESPONSES = Counter("lingo_chat_responses_total", "Chatbot replies, matched intent or default.")
+SCHEDULER = Counter("lingo_scheduler_total", "Upstream scheduler decisions: coalesced, throttled, degraded.")
+
+METRICS = [SPAN_SECONDS, PROVIDER_CALLS, PROVIDER_ERRORS, TRANSLATIONS, CHAT_RESPONSES, SCHEDULER]
+
+# Callables returning [(name, type, help, [(labels dict, value), ...])], read at exposition time
+_collectors: List[Callable[[], list]] = []
+
+
+def register_collector(collector: Callable[[], list]) -> None:
+    if enabled:
+        _collectors.append(collector)
+
+
+def inc(counter: Counter, amount: float = 1, **labels) -> None:
+    if enabled:
+        counter.inc(amount, **labels)
+
+
+def observe(histogram: Histogram, value: float, **labels) -> None:
+    if enabled:
+        histogram.observe(value, **labels)
+
+
+# ---------- JSON log ----------
+_log_lock = threading.Lock()
+_log_file = None
+
+
+def _log_stream():
+    global _log_file
+    if _log_file is None:
+        _log_file = sys.stderr if settings.METRICS_LOG == "-" else open(settings.METRICS_LOG, "a", encoding="utf-8")
+    return _log_file
+
+
+def log_event(event: str, **fields) -> None:
+    if not settings.METRICS_LOG:
+        return
+    line = json.dumps({"ts": round(time.time(), 6), "event": event, **fields}, ensure_ascii=False, default=str)
+    with _log_lock:
+        stream = _log_stream()
+        stream.write(line + "\n")
+        stream.flush()
+
+
+# ---------- Spans ----------
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        SPAN_SECONDS.observe(seconds, span=self.name, **self.labels)
+        if settings.METRICS_LOG:
+            log_event("span", name=self.name, seconds=round(seconds, 6),
+                      error=exc_type.__name__ if exc_type else None, **self.labels)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **labels):
+    # with metrics.span("provider", provider="mymemory"): ...
+    return _Span(name, labels) if enabled else _NOOP
+
+
+# ---------- Exposition ----------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def render_prometheus() -> str:
+    lines = []
+    for metric in METRICS:
+        kind = "histogram" if isinstance(metric, Histogram) else "counter"
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {kind}")
+        lines.extend(f"{name}{_format_labels(labels)} {value!r}" for name, labels, value in metric.samples())
+    for collector in _collectors:
+        for name, kind, help, samples in collector():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{_format_labels(_labels(labels))} {value!r}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str) -> None:
+    # Written next to the target and renamed, so a scraper never sees half a file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+
+
+def _serve(port: int) -> None:
+    # http.server is only imported when the endpoint is actually wanted
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_exporters() -> None:
+    # Once per process: the periodic text file and/or the /metrics endpoint
+    global _exporters_started
+    if not settings.METRICS or _exporters_started:
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        if settings.METRICS_FILE:
+            def write_loop():
+                while True:
+                    try:
+                        write_textfile(settings.METRICS_FILE)
+                    except OSError:
+                        pass
+                    time.sleep(settings.METRICS_FILE_SECONDS)
+
+            threading.Thread(target=write_loop, name="metrics-textfile", daemon=True).start()
+        if settings.METRICS_PORT:
+            _serve(settings.METRICS_PORT)
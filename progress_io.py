@@ -0,0 +1,236 @@
+"""Bulk export and import of every learner's progress, as JSONL.
+
+    python progress_io.py export backup.jsonl.gz
+    python progress_io.py import backup.jsonl.gz [--replace] [--batch 500]
+
+One line per user (".gz" paths are gzip-compressed, "-" is stdout/stdin):
+
+    {"user_id": "...", "completed_at": {"3": 1700000000.0},
+     "quiz_scores": {"2": {"score": 4, "total": 5, "taken_at": 1700000000.0}},
+     "review_cards": [[lesson_id, item, due, interval, ease, reps, lapses], ...]}
+
+The Export page's single-user format ("completed": [lesson ids]) is accepted
+as well. Both directions stream: export pages through the backend's user ids
+and writes each user as it is read, import parses one line at a time and
+hands the backend batches of at most ``--batch`` writes, so memory doesn't
+grow with the file. Lesson, quiz and card ids are checked against sets built
+once from the current content; a malformed record is reported and skipped,
+unknown ids are reported and dropped, and the import carries on either way.
+
+Imports write to the backend directly (after flushing the write-behind
+buffer); sessions that already loaded a user's progress see it on their next
+load.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+import settings
+from content import GENERATED_QUIZ_BASE, get_content
+from progress_store import COMPLETE, QUIZ, RESET, REVIEW, get_progress_store
+
+MAX_REPORTED = 100          # problems kept per report; the rest are only counted
+USER_PAGE = 1000            # user ids fetched per backend query during export
+
+
+class ImportReport:
+    def __init__(self):
+        self.records = 0            # non-blank lines read
+        self.users = 0              # records imported (possibly in part)
+        self.writes = 0             # backend operations written
+        self.skipped = 0            # records rejected outright
+        self.dropped = 0            # unknown or invalid ids left out of imported records
+        self.problems: List[Tuple[int, str]] = []       # (line number, message), first MAX_REPORTED
+
+    def problem(self, line: int, message: str) -> None:
+        if len(self.problems) < MAX_REPORTED:
+            self.problems.append((line, message))
+
+    def summary(self) -> str:
+        return (f"{self.users} users imported from {self.records} records, {self.writes} writes; "
+                f"{self.skipped} records skipped, {self.dropped} ids dropped")
+
+
+# ---------- Files ----------
+@contextmanager
+def open_lines(path: str, mode: str) -> Iterator[IO[str]]:
+    # Text file for reading ("r") or writing ("w"); written files appear atomically when complete
+    if path == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+        return
+    target = path if mode == "r" else f"{path}.{os.getpid()}.tmp"
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(target, mode + "t", encoding="utf-8") as f:
+        yield f
+    if mode == "w":
+        os.replace(target, path)
+
+
+# ---------- Export ----------
+def export_records(store=None) -> Iterator[dict]:
+    store = store or get_progress_store()
+    store.buffer.flush()
+    backend, after = store.backend, ""
+    while True:
+        user_ids = backend.user_ids(after, USER_PAGE)
+        for user_id in user_ids:
+            progress = backend.load(user_id)
+            yield {
+                "user_id": user_id,
+                "completed_at": {str(k): v for k, v in progress.completed.items()},
+                "quiz_scores": {str(k): {"score": s, "total": t, "taken_at": ts}
+                                for k, (s, t, ts) in progress.quiz_scores.items()},
+                "review_cards": [[*key, *state] for key, state in sorted(backend.load_cards(user_id).items())],
+            }
+        if len(user_ids) < USER_PAGE:
+            return
+        after = user_ids[-1]
+
+
+def export_progress(f: IO[str], store=None) -> int:
+    count = 0
+    for record in export_records(store):
+        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+# ---------- Import ----------
+def _number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _id(value) -> Optional[int]:
+    # Record ids arrive as JSON ints or, as object keys, strings
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Validator:
+    # Turns one parsed record into backend operations, using id sets built once from the content
+    def __init__(self, content, now: float):
+        self.lesson_ids = content.lesson_ids
+        self.quiz_ids = content.quiz_ids
+        self.item_counts = content.item_counts
+        self.now = now
+
+    def _quiz_known(self, quiz_id: int) -> bool:
+        return quiz_id in self.quiz_ids or quiz_id - GENERATED_QUIZ_BASE in self.lesson_ids
+
+    def ops(self, record) -> Tuple[str, List[tuple], int]:
+        # (user id, operations, ids dropped); ValueError for a record that can't be imported at all
+        if not isinstance(record, dict):
+            raise ValueError("not a JSON object")
+        user_id = record.get("user_id")
+        if not isinstance(user_id, str) or not user_id:
+            raise ValueError("missing user_id")
+        completed_at = record.get("completed_at", {})
+        completed = record.get("completed", [])
+        quiz_scores = record.get("quiz_scores", {})
+        cards = record.get("review_cards", [])
+        for field, value, kind in (("completed_at", completed_at, dict), ("completed", completed, list),
+                                   ("quiz_scores", quiz_scores, dict), ("review_cards", cards, list)):
+            if not isinstance(value, kind):
+                raise ValueError(f"'{field}' should be a {'list' if kind is list else 'object'}")
+
+        ops, dropped = [], 0
+        lessons = {lesson_id: self.now for lesson_id in map(_id, completed)}
+        for key, stamp in completed_at.items():
+            lessons[_id(key)] = stamp if _number(stamp) else self.now
+        for lesson_id, stamp in lessons.items():
+            if lesson_id in self.lesson_ids:
+                ops.append((COMPLETE, user_id, lesson_id, stamp))
+            else:
+                dropped += 1
+        for key, entry in quiz_scores.items():
+            quiz_id = _id(key)
+            if (quiz_id is not None and self._quiz_known(quiz_id) and isinstance(entry, dict)
+                    and isinstance(entry.get("score"), int) and isinstance(entry.get("total"), int)
+                    and 0 <= entry["score"] <= entry["total"]):
+                taken_at = entry.get("taken_at")
+                ops.append((QUIZ, user_id, quiz_id, (entry["score"], entry["total"],
+                                                     taken_at if _number(taken_at) else self.now)))
+            else:
+                dropped += 1
+        for card in cards:
+            if (isinstance(card, list) and len(card) == 7 and all(_number(x) for x in card[2:])
+                    and _id(card[0]) == card[0] and _id(card[1]) == card[1]
+                    and 0 <= card[1] < self.item_counts.get(card[0], 0)):
+                ops.append((REVIEW, user_id, (card[0], card[1]), tuple(card[2:])))
+            else:
+                dropped += 1
+        return user_id, ops, dropped
+
+
+def import_progress(lines: Iterable[str], replace: bool = False, batch: int = settings.PROGRESS_FLUSH_BATCH,
+                    store=None) -> ImportReport:
+    # replace: each imported user's completed lessons are replaced (as the Export page does), not merged
+    store = store or get_progress_store()
+    store.buffer.flush()
+    validator = _Validator(get_content(), time.time())
+    report = ImportReport()
+    pending: List[tuple] = []
+
+    def write():
+        store.backend.write_batch(pending)
+        report.writes += len(pending)
+        pending.clear()
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        report.records += 1
+        try:
+            user_id, ops, dropped = validator.ops(json.loads(line))
+        except ValueError as e:     # json.JSONDecodeError included
+            report.skipped += 1
+            report.problem(number, f"skipped: {e}")
+            continue
+        if dropped:
+            report.dropped += dropped
+            report.problem(number, f"{dropped} unknown or invalid ids dropped")
+        if replace:
+            ops.insert(0, (RESET, user_id, None, None))
+        report.users += 1
+        pending.extend(ops)
+        if len(pending) >= batch:
+            write()
+    if pending:
+        write()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_cmd = commands.add_parser("export", help="write every user's progress")
+    export_cmd.add_argument("path", help="output .jsonl / .jsonl.gz, or - for stdout")
+    import_cmd = commands.add_parser("import", help="read users' progress into the store")
+    import_cmd.add_argument("path", help="input .jsonl / .jsonl.gz, or - for stdin")
+    import_cmd.add_argument("--replace", action="store_true", help="replace completed lessons instead of merging")
+    import_cmd.add_argument("--batch", type=int, default=settings.PROGRESS_FLUSH_BATCH, help="writes per transaction")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "export":
+        with open_lines(args.path, "w") as f:
+            count = export_progress(f)
+        print(f"{count} users exported ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+        return
+    with open_lines(args.path, "r") as f:
+        report = import_progress(f, replace=args.replace, batch=max(1, args.batch))
+    for number, message in report.problems:
+        print(f"line {number}: {message}", file=sys.stderr)
+    print(f"{report.summary()} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""Server-side learner progress, keyed by user id.
+
+Writes go into a write-behind buffer that coalesces repeated updates and is
+flushed to the backend in one transaction per batch, either every
+``PROGRESS_FLUSH_SECONDS`` or as soon as ``PROGRESS_FLUSH_BATCH`` updates are
+pending. SQLite is the default backend; anything implementing
+``ProgressBackend`` can be plugged in via ``BACKENDS``.
+"""
+
+import atexit
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import settings
+
+# Buffered operations: (kind, user_id, key, payload)
+COMPLETE, UNCOMPLETE, QUIZ, RESET, REVIEW = "complete", "uncomplete", "quiz", "reset", "review"
+
+# Review card state: (lesson_id, item) -> (due, interval, ease, reps, lapses)
+CardStates = Dict[Tuple[int, int], tuple]
+
+
+class UserProgress:
+    def __init__(self, user_id: str, completed: Optional[Dict[int, float]] = None,
+                 quiz_scores: Optional[Dict[int, Tuple[int, int, float]]] = None):
+        self.user_id = user_id
+        self.completed = completed or {}           # lesson_id -> completed_at
+        self.quiz_scores = quiz_scores or {}       # quiz_id -> (score, total, taken_at)
+
+    @property
+    def completed_ids(self) -> set:
+        return set(self.completed)
+
+    @property
+    def last_activity(self) -> Optional[float]:
+        stamps = list(self.completed.values()) + [ts for _, _, ts in self.quiz_scores.values()]
+        return max(stamps) if stamps else None
+
+    def percent(self, total_lessons: int) -> int:
+        return int((len(self.completed) / total_lessons) * 100) if total_lessons else 0
+
+
+def _apply(progress: UserProgress, op: tuple) -> None:
+    # One lesson or quiz operation (not REVIEW) applied to an in-memory UserProgress
+    kind, _, key, payload = op
+    if kind == COMPLETE:
+        progress.completed[key] = payload
+    elif kind == UNCOMPLETE:
+        progress.completed.pop(key, None)
+    elif kind == QUIZ:
+        progress.quiz_scores[key] = payload
+    elif kind == RESET:
+        progress.completed.clear()
+
+
+# ---------- Backends ----------
+class ProgressBackend:
+    def load(self, user_id: str) -> UserProgress:
+        raise NotImplementedError
+
+    def load_cards(self, user_id: str) -> CardStates:
+        raise NotImplementedError
+
+    def user_ids(self, after: str = "", limit: int = 1000) -> List[str]:
+        # Next `limit` users with any stored state, in id order after `after` (for paging through all of them)
+        raise NotImplementedError
+
+    def write_batch(self, ops: List[tuple]) -> None:
+        # Apply buffered operations, in order, atomically
+        raise NotImplementedError
+
+
+class MemoryProgressBackend(ProgressBackend):
+    def __init__(self, path=None):
+        self._users: Dict[str, UserProgress] = {}
+        self._cards: Dict[str, CardStates] = {}
+        self._lock = threading.Lock()
+
+    def load(self, user_id: str) -> UserProgress:
+        with self._lock:
+            p = self._users.get(user_id)
+            return UserProgress(user_id, dict(p.completed), dict(p.quiz_scores)) if p else UserProgress(user_id)
+
+    def load_cards(self, user_id: str) -> CardStates:
+        with self._lock:
+            return dict(self._cards.get(user_id, {}))
+
+    def user_ids(self, after: str = "", limit: int = 1000) -> List[str]:
+        with self._lock:
+            return sorted(u for u in self._users.keys() | self._cards.keys() if u > after)[:limit]
+
+    def write_batch(self, ops: List[tuple]) -> None:
+        with self._lock:
+            for op in ops:
+                kind, user_id, key, payload = op
+                if kind == REVIEW:
+                    self._cards.setdefault(user_id, {})[key] = payload
+                else:
+                    _apply(self._users.setdefault(user_id, UserProgress(user_id)), op)
+
+
+class SQLiteProgressBackend(ProgressBackend):
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS lesson_progress (
+                       user_id TEXT NOT NULL,
+                       lesson_id INTEGER NOT NULL,
+                       completed_at REAL NOT NULL,
+                       PRIMARY KEY (user_id, lesson_id)
+                   )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS quiz_scores (
+                       user_id TEXT NOT NULL,
+                       quiz_id INTEGER NOT NULL,
+                       score INTEGER NOT NULL,
+                       total INTEGER NOT NULL,
+                       taken_at REAL NOT NULL,
+                       PRIMARY KEY (user_id, quiz_id)
+                   )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS review_cards (
+                       user_id TEXT NOT NULL,
+                       lesson_id INTEGER NOT NULL,
+                       item INTEGER NOT NULL,
+                       due REAL NOT NULL,
+                       interval REAL NOT NULL,
+                       ease REAL NOT NULL,
+                       reps INTEGER NOT NULL,
+                       lapses INTEGER NOT NULL,
+                       PRIMARY KEY (user_id, lesson_id, item)
+                   ) WITHOUT ROWID"""
+            )
+
+    def load(self, user_id: str) -> UserProgress:
+        with self._lock:
+            completed = dict(self._conn.execute(
+                "SELECT lesson_id, completed_at FROM lesson_progress WHERE user_id = ?", (user_id,)
+            ))
+            scores = {
+                quiz_id: (score, total, taken_at)
+                for quiz_id, score, total, taken_at in self._conn.execute(
+                    "SELECT quiz_id, score, total, taken_at FROM quiz_scores WHERE user_id = ?", (user_id,)
+                )
+            }
+        return UserProgress(user_id, completed, scores)
+
+    def load_cards(self, user_id: str) -> CardStates:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lesson_id, item, due, interval, ease, reps, lapses FROM review_cards WHERE user_id = ?",
+                (user_id,),
+            ).fetchall()
+        return {(row[0], row[1]): row[2:] for row in rows}
+
+    def user_ids(self, after: str = "", limit: int = 1000) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT user_id FROM lesson_progress WHERE user_id > ?1"
+                " UNION SELECT user_id FROM quiz_scores WHERE user_id > ?1"
+                " UNION SELECT user_id FROM review_cards WHERE user_id > ?1"
+                " ORDER BY user_id LIMIT ?2",
+                (after, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def write_batch(self, ops: List[tuple]) -> None:
+        with self._lock, self._conn:
+            for kind, user_id, key, payload in ops:
+                if kind == COMPLETE:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO lesson_progress (user_id, lesson_id, completed_at) VALUES (?, ?, ?)",
+                        (user_id, key, payload),
+                    )
+                elif kind == UNCOMPLETE:
+                    self._conn.execute(
+                        "DELETE FROM lesson_progress WHERE user_id = ? AND lesson_id = ?", (user_id, key)
+                    )
+                elif kind == QUIZ:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO quiz_scores (user_id, quiz_id, score, total, taken_at) VALUES (?, ?, ?, ?, ?)",
+                        (user_id, key, *payload),
+                    )
+                elif kind == RESET:
+                    self._conn.execute("DELETE FROM lesson_progress WHERE user_id = ?", (user_id,))
+                elif kind == REVIEW:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO review_cards (user_id, lesson_id, item, due, interval, ease, reps, lapses)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (user_id, *key, *payload),
+                    )
+
+
+BACKENDS = {
+    "sqlite": SQLiteProgressBackend,
+    "memory": MemoryProgressBackend,
+}
+
+
+# ---------- Write-behind buffer ----------
+class WriteBehindBuffer:
+    def __init__(self, backend: ProgressBackend, flush_interval: float = settings.PROGRESS_FLUSH_SECONDS,
+                 flush_batch: int = settings.PROGRESS_FLUSH_BATCH):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        # Keyed by (user, lesson/quiz/card): a later update to the same row replaces the earlier one
+        self._pending: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="progress-flush", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _slot(op: tuple) -> tuple:
+        kind, user_id, key, _ = op
+        if kind == RESET:
+            return (user_id, RESET, None)
+        return (user_id, kind if kind in (QUIZ, REVIEW) else "lesson", key)
+
+    def add(self, op: tuple) -> None:
+        kind, user_id = op[0], op[1]
+        slot = self._slot(op)
+        with self._lock:
+            if kind == RESET:
+                # Everything queued for this user's lessons is superseded
+                for k in [k for k in self._pending if k[0] == user_id and k[1] in ("lesson", RESET)]:
+                    del self._pending[k]
+            self._pending.pop(slot, None)      # re-insert so ordering follows the latest write
+            self._pending[slot] = op
+            full = len(self._pending) >= self.flush_batch
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                ops = list(self._pending.values())
+                self._pending.clear()
+            if not ops:
+                return 0
+            try:
+                self.backend.write_batch(ops)
+            except Exception:
+                # Put the batch back in front of anything queued meanwhile
+                with self._lock:
+                    newer = self._pending
+                    self._pending = {self._slot(op): op for op in ops}
+                    for slot, op in newer.items():
+                        self._pending.pop(slot, None)
+                        self._pending[slot] = op
+                raise
+            return len(ops)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def read(self, user_id: str, load):
+        # (load(user_id), that user's queued ops in write order). Holding the flush lock keeps
+        # a concurrent flush from moving ops between the backend read and the queue snapshot
+        with self._flush_lock:
+            stored = load(user_id)
+            with self._lock:
+                ops = [op for op in self._pending.values() if op[1] == user_id]
+        return stored, ops
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass    # batch was re-queued; keep the thread alive and retry next round
+
+
+# ---------- Store ----------
+class ProgressStore:
+    def __init__(self, backend: ProgressBackend):
+        self.backend = backend
+        self.buffer = WriteBehindBuffer(backend)
+        atexit.register(self.buffer.flush)
+
+    # Reads see this user's queued writes applied on top of the backend, without
+    # flushing everyone else's on the request thread
+    def load(self, user_id: str) -> UserProgress:
+        progress, ops = self.buffer.read(user_id, self.backend.load)
+        for op in ops:
+            if op[0] != REVIEW:
+                _apply(progress, op)
+        return progress
+
+    def load_cards(self, user_id: str) -> CardStates:
+        cards, ops = self.buffer.read(user_id, self.backend.load_cards)
+        for kind, _, key, payload in ops:
+            if kind == REVIEW:
+                cards[key] = payload
+        return cards
+
+    # Writers update the caller's cached UserProgress immediately and queue the
+    # same change for the backend, so a session never has to re-read its own writes.
+    def complete_lessons(self, progress: UserProgress, lesson_ids: Iterable[int]) -> None:
+        now = time.time()
+        for lesson_id in lesson_ids:
+            if lesson_id not in progress.completed:
+                progress.completed[lesson_id] = now
+                self.buffer.add((COMPLETE, progress.user_id, lesson_id, now))
+
+    def uncomplete_lesson(self, progress: UserProgress, lesson_id: int) -> None:
+        progress.completed.pop(lesson_id, None)
+        self.buffer.add((UNCOMPLETE, progress.user_id, lesson_id, None))
+
+    def reset(self, progress: UserProgress) -> None:
+        progress.completed.clear()
+        self.buffer.add((RESET, progress.user_id, None, None))
+
+    def replace_completed(self, progress: UserProgress, lesson_ids: Iterable[int]) -> None:
+        self.reset(progress)
+        self.complete_lessons(progress, lesson_ids)
+
+    def record_quiz(self, progress: UserProgress, quiz_id: int, score: int, total: int) -> None:
+        entry = (score, total, time.time())
+        progress.quiz_scores[quiz_id] = entry
+        self.buffer.add((QUIZ, progress.user_id, quiz_id, entry))
+
+    def record_review(self, user_id: str, card) -> None:
+        # card: review.Card, already rescheduled in the caller's deck
+        self.buffer.add((REVIEW, user_id, card.key, card.state()))
+
+
+_store: Optional[ProgressStore] = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store() -> ProgressStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = BACKENDS[settings.PROGRESS_BACKEND](settings.PROGRESS_DB_PATH)
+                _store = ProgressStore(backend)
+    return _store
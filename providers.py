@@ -0,0 +1,184 @@
+"""Shared HTTP client for the remote translation providers.
+
+All provider calls go through one pooled keep-alive ``requests.Session``.
+Each provider gets its own mounted adapter (connection limit + bounded
+retries with capped exponential backoff, never waiting on Retry-After) and its own circuit breaker, so a provider
+that keeps failing is skipped immediately instead of costing a full timeout.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+import settings
+
+
+class ProviderError(Exception):
+    pass
+
+
+class ProviderUnavailable(ProviderError):
+    # Raised without touching the network while the provider's breaker is open
+    pass
+
+
+class ProviderThrottled(ProviderUnavailable):
+    # Raised by the scheduler when the provider's rate or daily quota is used up
+    pass
+
+
+class QuotaExceeded(ProviderError):
+    # The provider itself reported that the daily quota is gone
+    pass
+
+
+# ---------- Circuit breaker ----------
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = settings.BREAKER_FAILURES,
+                 reset_timeout: float = settings.BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN      # let exactly one probe request through
+                return True
+            return False
+
+    def is_open(self) -> bool:
+        # Open and still cooling down; once reset_timeout passes the next call may probe
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+# ---------- Pooled client ----------
+class ProviderClient:
+    def __init__(self):
+        self.session = requests.Session()
+        self.breakers = {}
+        self.base_urls = {}
+        self.timeout = (settings.PROVIDER_CONNECT_TIMEOUT, settings.PROVIDER_READ_TIMEOUT)
+
+    def register(self, name: str, base_url: str, pool_size: int = settings.PROVIDER_POOL_SIZE,
+                 retries: int = settings.PROVIDER_RETRIES, backoff: float = settings.PROVIDER_BACKOFF) -> None:
+        # 429 isn't retried here: throttling goes to the breaker and the scheduler. Retry-After is
+        # ignored and each backoff capped, so all retries together sleep at most the read timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            backoff_max=settings.PROVIDER_READ_TIMEOUT / max(1, retries),
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        # pool_block caps concurrent connections to this provider at pool_size
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=retry)
+        base_url = base_url.rstrip("/") + "/"
+        self.session.mount(base_url, adapter)
+        self.base_urls[name] = base_url
+        self.breakers[name] = CircuitBreaker()
+
+    def request(self, name: str, method: str, path: str, **kwargs) -> requests.Response:
+        breaker = self.breakers[name]
+        if not breaker.allow():
+            raise ProviderUnavailable(f"{name} circuit is open")
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            resp = self.session.request(method, self.base_urls[name] + path.lstrip("/"), **kwargs)
+        except requests.RequestException as e:
+            breaker.record_failure()
+            raise ProviderError(f"{name} request failed: {e}") from e
+        if resp.status_code >= 500 or resp.status_code == 429:
+            breaker.record_failure()
+            raise ProviderError(f"{name} returned HTTP {resp.status_code}")
+        breaker.record_success()
+        return resp
+
+    def is_healthy(self, name: str) -> bool:
+        # Providers without a breaker (e.g. the local model) are always considered healthy
+        breaker = self.breakers.get(name)
+        return breaker is None or not breaker.is_open()
+
+
+client = ProviderClient()
+client.register("libretranslate", settings.LIBRETRANSLATE_URL)
+client.register("mymemory", settings.MYMEMORY_URL)
+
+
+def _collect_metrics() -> list:
+    return [("lingo_provider_circuit_open", "gauge", "1 while the provider's circuit breaker is open.",
+             [({"provider": name}, int(breaker.is_open())) for name, breaker in client.breakers.items()])]
+
+
+metrics.register_collector(_collect_metrics)
+
+
+# ---------- Providers ----------
+def libretranslate(text: str, target: str = "de") -> str:
+    resp = client.request(
+        "libretranslate", "POST", "/translate",
+        json={"q": text, "source": "auto", "target": target, "format": "text"},
+    )
+    if not resp.ok:
+        raise ProviderError(f"libretranslate returned HTTP {resp.status_code}")
+    try:
+        translated = resp.json().get("translatedText")
+    except ValueError as e:
+        raise ProviderError("libretranslate returned invalid JSON") from e
+    if not translated:
+        raise ProviderError("libretranslate returned no translation")
+    return translated
+
+
+def mymemory(text: str, target: str = "de") -> str:
+    resp = client.request(
+        "mymemory", "GET", "/get",
+        params={"q": text, "langpair": "en|de" if target == "de" else "de|en"},
+    )
+    try:
+        data = resp.json()
+    except ValueError as e:
+        raise ProviderError("mymemory returned invalid JSON") from e
+    # MyMemory reports quota and validation errors in the body with HTTP 200
+    status = data.get("responseStatus", 200)
+    if str(status) == "429":
+        raise QuotaExceeded("mymemory daily quota exceeded")
+    if str(status) != "200":
+        raise ProviderError(f"mymemory returned status {status}")
+    translated = (data.get("responseData") or {}).get("translatedText")
+    if not translated:
+        raise ProviderError("mymemory returned no translation")
+    if translated.startswith("MYMEMORY WARNING"):
+        raise QuotaExceeded(f"mymemory: {translated}")
+    return translated
+
+
+PROVIDERS = {
+    "libretranslate": libretranslate,
+    "mymemory": mymemory,
+}
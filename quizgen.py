@@ -0,0 +1,146 @@
+"""Practice quizzes generated from the lesson vocabulary.
+
+Every en/de pair gives two multiple-choice questions ("How do you say ... in
+German?" and back). Distractors are the answers most similar to the right
+one: each phrase is a hashed character-trigram vector, L2-normalised, so
+one matrix product scores a whole quiz's questions against the corpus by
+cosine similarity. Phrases from the same lesson get a bonus, and phrases
+that fold to the same text as the answer never appear as distractors.
+
+The vectors are built once per content version (in the warm-up). The
+first quiz of a lesson scores all of its phrases at once and keeps each
+phrase's closest candidates; after that a quiz is only a seeded draw from
+those pools, so a (lesson, seed) pair always gives the same quiz. Pools and
+quizzes are memoised on the generator, which is rebuilt when the content
+changes.
+"""
+
+import functools
+import random
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+import settings
+from content import GENERATED_QUIZ_BASE, get_content
+from textnorm import fold, normalize
+
+NGRAM_DIMS = 128            # hashed trigram buckets per phrase vector
+SAME_LESSON_BONUS = 0.15    # added to the cosine of phrases from the question's lesson
+CANDIDATES = 24             # nearest phrases considered per question
+POOL = 6                    # distractors are drawn at random from the closest POOL
+DISTRACTORS = 3
+
+
+def _vectorize(texts: List[str]) -> np.ndarray:
+    # Rows of unit-length trigram counts; crc32 keeps the hashing stable across processes
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        padded = f" {fold(text)} "
+        for k in range(len(padded) - 2):
+            rows.append(row)
+            cols.append(zlib.crc32(padded[k:k + 3].encode("utf-8")) % NGRAM_DIMS)
+    vectors = np.zeros((len(texts), NGRAM_DIMS), dtype=np.float32)
+    np.add.at(vectors, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _groups(texts: List[str]) -> np.ndarray:
+    # Same id for phrases that normalise to the same text ("Danke!" and "danke")
+    ids: Dict[str, int] = {}
+    return np.asarray([ids.setdefault(normalize(text), len(ids)) for text in texts], dtype=np.int64)
+
+
+class QuizGenerator:
+    def __init__(self, lessons: Iterable[dict]):
+        self.texts: Dict[str, List[str]] = {"en": [], "de": []}
+        self.titles: Dict[int, str] = {}
+        self.rows: Dict[int, List[int]] = {}          # lesson_id -> its rows in the arrays below
+        lesson_ids = []
+        for lesson in lessons:
+            self.titles[lesson["lesson_id"]] = lesson["title"]
+            for pair in lesson.get("content", []):
+                self.rows.setdefault(lesson["lesson_id"], []).append(len(lesson_ids))
+                lesson_ids.append(lesson["lesson_id"])
+                self.texts["en"].append(pair["en"])
+                self.texts["de"].append(pair["de"])
+        self.lesson_ids = np.asarray(lesson_ids, dtype=np.int64)
+        self.vectors = {lang: _vectorize(texts) for lang, texts in self.texts.items()}
+        self.groups = {lang: _groups(texts) for lang, texts in self.texts.items()}
+        self.pools = functools.lru_cache(maxsize=4096)(self._pools)
+        self.quiz = functools.lru_cache(maxsize=256)(self._quiz)
+
+    def __len__(self) -> int:
+        return len(self.lesson_ids)
+
+    def candidates(self, rows: List[int], lang: str) -> List[List[str]]:
+        # Closest wrong options in `lang` for each row's phrase, scored in one matrix product
+        vectors, groups = self.vectors[lang], self.groups[lang]
+        rows = np.asarray(rows, dtype=np.intp)
+        sims = (vectors @ vectors[rows].T).T        # this orientation is the faster BLAS call
+        sims += SAME_LESSON_BONUS * (self.lesson_ids[rows][:, None] == self.lesson_ids[None, :])
+        sims[groups[rows][:, None] == groups[None, :]] = -np.inf
+        k = min(CANDIDATES, sims.shape[1])
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k] if k < sims.shape[1] else np.argsort(-sims, axis=1)
+        result = []
+        for i in range(len(rows)):
+            pool, seen = [], set()
+            for j in top[i][np.argsort(-sims[i, top[i]])]:
+                if sims[i, j] == -np.inf or len(pool) == POOL:
+                    break
+                if groups[j] not in seen:
+                    seen.add(groups[j])
+                    pool.append(self.texts[lang][j])
+            result.append(pool)
+        return result
+
+    def _pools(self, lesson_id: int) -> Dict[str, Dict[int, List[str]]]:
+        # lang -> row -> distractor candidates, for every phrase of the lesson
+        rows = self.rows.get(lesson_id, [])
+        return {lang: dict(zip(rows, self.candidates(rows, lang))) if rows else {} for lang in ("de", "en")}
+
+    def _quiz(self, lesson_id: int, seed: int = 0, size: int = settings.QUIZGEN_QUESTIONS) -> Optional[dict]:
+        # Quiz dict in the hand-written quizzes' format, or None for a lesson without content
+        rows = self.rows.get(lesson_id)
+        if not rows:
+            return None
+        rng = random.Random(f"{lesson_id}:{seed}")
+        asks = [(row, "de") for row in rows] + [(row, "en") for row in rows]
+        rng.shuffle(asks)
+        pools = self.pools(lesson_id)
+        questions = []
+        for row, lang in asks[:size]:
+            source, answer = (self.texts["en"][row], self.texts["de"][row]) if lang == "de" else \
+                             (self.texts["de"][row], self.texts["en"][row])
+            pool = pools[lang][row]
+            options = rng.sample(pool, min(DISTRACTORS, len(pool))) + [answer]
+            rng.shuffle(options)
+            question = f"How do you say '{source}' in German?" if lang == "de" else f"What does '{source}' mean?"
+            questions.append({"question": question, "options": options, "answer": answer})
+        return {
+            "quiz_id": GENERATED_QUIZ_BASE + lesson_id,
+            "variant": seed,
+            "title": f"Lesson {lesson_id}: {self.titles[lesson_id]} — practice quiz",
+            "questions": questions,
+        }
+
+
+_generator: Optional[QuizGenerator] = None
+_generator_version: Optional[str] = None
+_generator_lock = threading.Lock()
+
+
+def get_quiz_generator() -> QuizGenerator:
+    # Rebuilt (and its memoised quizzes dropped) only when the content changes
+    global _generator, _generator_version
+    content = get_content()
+    if content.version != _generator_version:
+        with _generator_lock:
+            if content.version != _generator_version:
+                _generator = QuizGenerator(content.iter_lessons())
+                _generator_version = content.version
+    return _generator
@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    # Classic token bucket: `rate` tokens per second, up to `capacity` stored.
+    # `keep` makes a caller leave that many tokens behind, for callers that don't.
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1, keep: float = 0) -> bool:
+        keep = min(keep, self.capacity - tokens)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens - keep >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None, keep: float = 0) -> bool:
+        # Blocks until the tokens are available; False if that would exceed `timeout`
+        keep = min(keep, self.capacity - tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens - keep >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens + keep - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class DailyQuota:
+    # Units (e.g. characters) per UTC day, reset at midnight like the providers do; limit 0 = unlimited.
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.exhausted = False          # the provider itself said the quota is gone
+        self.day = self._today()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today() -> int:
+        return int(time.time() // 86400)
+
+    def _roll(self) -> None:
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+            self.exhausted = False
+
+    def try_acquire(self, amount: int, keep: int = 0) -> bool:
+        with self._lock:
+            self._roll()
+            if self.exhausted:
+                return False
+            if self.limit and self.used + amount > self.limit - keep:
+                return False
+            self.used += amount
+            return True
+
+    def release(self, amount: int) -> None:
+        with self._lock:
+            self.used = max(0, self.used - amount)
+
+    def exhaust(self) -> None:
+        with self._lock:
+            self._roll()
+            self.exhausted = True
+
+    def remaining(self) -> Optional[int]:
+        # None when unlimited and not exhausted
+        with self._lock:
+            self._roll()
+            if self.exhausted:
+                return 0
+            return max(0, self.limit - self.used) if self.limit else None
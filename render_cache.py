@@ -0,0 +1,59 @@
+"""Prebuilt markdown for the lesson and status lists.
+
+Each lesson's vocabulary is one markdown table and each page of a status
+list is one markdown block, so a page sends a single element for them
+instead of one per item or line. Blocks are memoised per process, shared by
+every session, and rebuilt when the content changes. A status block is
+keyed by the completion state of the lessons it shows, so learners at the
+same point reuse the same string.
+"""
+
+import functools
+import threading
+from typing import Optional, Tuple
+
+import settings
+from content import get_content
+
+
+def _cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+class RenderCache:
+    def __init__(self, content):
+        self.content = content
+        size = settings.RENDER_CACHE_BLOCKS
+        self.lesson_table = functools.lru_cache(maxsize=size)(self._lesson_table)
+        self.status_list = functools.lru_cache(maxsize=size)(self._status_list)
+
+    def _lesson_table(self, lesson_id: int) -> str:
+        items = self.content.lesson_by_id[lesson_id].get("content", [])
+        if not items:
+            return "*No words in this lesson yet.*"
+        rows = ["| # | English | German |", "|---:|---|---|"]
+        for idx, item in enumerate(items, start=1):
+            rows.append(f"| {idx} | **{_cell(item['en'])}** | *{_cell(item['de'])}* |")
+        return "\n".join(rows)
+
+    def _status_list(self, start: int, stop: int, states: Tuple[Optional[str], ...]) -> str:
+        # states: per lesson at catalog positions [start, stop), its status text or None when not started
+        labels = self.content.lesson_labels[start:stop]
+        return "  \n".join(f"**{label}** — *{state or '◻️ Not started'}*" for label, state in zip(labels, states))
+
+
+_cache: Optional[RenderCache] = None
+_cache_version: Optional[str] = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    # Rebuilt (dropping every block) only when the content changes
+    global _cache, _cache_version
+    content = get_content()
+    if content.version != _cache_version:
+        with _cache_lock:
+            if content.version != _cache_version:
+                _cache = RenderCache(content)
+                _cache_version = content.version
+    return _cache
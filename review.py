@@ -0,0 +1,179 @@
+"""Spaced-repetition review of lesson vocabulary (SM-2).
+
+Every en/de item of a completed lesson becomes a card. Grading a card moves
+its due time out by an interval that grows with each successful review and
+with the card's ease; a lapse sends it back to the start.
+
+A ``Deck`` holds one user's cards in a dict plus a heap ordered by due time,
+so the next card is found in O(log n) however large the deck is. Rescheduled
+cards are pushed again rather than moved; the stale heap entry is skipped
+when it surfaces. The due and learned counts are kept up to date as cards
+are graded and come due (a second heap of cards not yet counted as due), so
+showing them doesn't scan the deck either. Scheduling state is persisted through the progress store
+(write-behind, like lesson completion); card text is never stored, it is
+looked up in the current lesson content.
+"""
+
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from progress_store import get_progress_store
+
+DAY = 86400.0
+RELEARN_SECONDS = 600.0      # a lapsed card comes back after ten minutes
+MIN_EASE = 1.3
+
+# Grades offered in the UI, as SM-2 quality (0-5)
+AGAIN, HARD, GOOD, EASY = 1, 3, 4, 5
+
+CardKey = Tuple[int, int]    # (lesson_id, item index within the lesson)
+
+
+class Card:
+    __slots__ = ("lesson_id", "item", "due", "interval", "ease", "reps", "lapses")
+
+    def __init__(self, lesson_id: int, item: int, due: float, interval: float = 0.0,
+                 ease: float = 2.5, reps: int = 0, lapses: int = 0):
+        self.lesson_id = lesson_id
+        self.item = item
+        self.due = due
+        self.interval = interval     # days
+        self.ease = ease
+        self.reps = reps             # successful reviews in a row
+        self.lapses = lapses
+
+    @property
+    def key(self) -> CardKey:
+        return (self.lesson_id, self.item)
+
+    @property
+    def is_new(self) -> bool:
+        return self.reps == 0 and self.lapses == 0
+
+    def state(self) -> tuple:
+        # What the progress store persists
+        return (self.due, self.interval, self.ease, self.reps, self.lapses)
+
+
+def schedule(card: Card, quality: int, now: float) -> None:
+    # SM-2: quality < 3 is a lapse; otherwise 1 day, 6 days, then interval * ease
+    if quality < 3:
+        card.reps = 0
+        card.lapses += 1
+        card.interval = 0.0
+        card.due = now + RELEARN_SECONDS
+    else:
+        if card.reps == 0:
+            card.interval = 1.0
+        elif card.reps == 1:
+            card.interval = 6.0
+        else:
+            card.interval = round(card.interval * card.ease, 1)
+        card.reps += 1
+        card.due = now + card.interval * DAY
+    card.ease = max(MIN_EASE, round(card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02), 2))
+
+
+def _learned(card: Card) -> bool:
+    return card.reps >= 2
+
+
+class Deck:
+    def __init__(self, cards: Iterable[Card] = ()):
+        self.cards: Dict[CardKey, Card] = {card.key: card for card in cards}
+        self.learned = sum(1 for card in self.cards.values() if _learned(card))
+        self._synced = None
+        self._reindex(float("-inf"))
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def _reindex(self, now: float) -> None:
+        # Both heaps rebuilt from the cards (dropping stale entries), counting the cards due at `now`
+        entries = [(c.due, c.lesson_id, c.item) for c in self.cards.values()]
+        self._heap: List[Tuple[float, int, int]] = entries
+        heapq.heapify(self._heap)
+        self._due: Set[CardKey] = {(lesson_id, item) for due, lesson_id, item in entries if due <= now}
+        self._upcoming = [entry for entry in entries if entry[0] > now]     # not yet counted as due
+        heapq.heapify(self._upcoming)
+        self._counted_at = now
+
+    def _push(self, card: Card) -> None:
+        entry = (card.due, card.lesson_id, card.item)
+        heapq.heappush(self._heap, entry)
+        heapq.heappush(self._upcoming, entry)
+        if max(len(self._heap), len(self._upcoming)) > 2 * len(self.cards) + 64:
+            # Mostly stale entries: rebuild rather than let the heaps grow
+            self._reindex(self._counted_at)
+
+    def sync(self, content, lesson_ids: Iterable[int], now: Optional[float] = None) -> int:
+        # New cards for every item of the given lessons; cheap no-op when nothing changed
+        lesson_ids = sorted(lesson_ids)
+        stamp = (content.version, tuple(lesson_ids))
+        if stamp == self._synced:
+            return 0
+        self._synced = stamp
+        now = time.time() if now is None else now
+        added = 0
+        for lesson_id in lesson_ids:
+            for item in range(content.item_counts.get(lesson_id, 0)):
+                if (lesson_id, item) not in self.cards:
+                    card = self.cards[(lesson_id, item)] = Card(lesson_id, item, now)
+                    self._push(card)
+                    added += 1
+        return added
+
+    def peek(self) -> Optional[Card]:
+        # Card with the earliest due time, due or not
+        heap = self._heap
+        while heap:
+            due, lesson_id, item = heap[0]
+            card = self.cards.get((lesson_id, item))
+            if card is not None and card.due == due:
+                return card
+            heapq.heappop(heap)     # stale: the card was rescheduled or removed
+        return None
+
+    def next_due(self, now: Optional[float] = None) -> Optional[Card]:
+        card = self.peek()
+        now = time.time() if now is None else now
+        return card if card is not None and card.due <= now else None
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        # Only cards that came due since the last count are looked at
+        now = time.time() if now is None else now
+        if now < self._counted_at:
+            self._reindex(now)      # the clock went back: recount from scratch
+        upcoming = self._upcoming
+        while upcoming and upcoming[0][0] <= now:
+            due, lesson_id, item = heapq.heappop(upcoming)
+            card = self.cards.get((lesson_id, item))
+            if card is not None and card.due == due:
+                self._due.add(card.key)
+        self._counted_at = now
+        return len(self._due)
+
+    def grade(self, card: Card, quality: int, now: Optional[float] = None) -> None:
+        was_learned = _learned(card)
+        schedule(card, quality, time.time() if now is None else now)
+        self.learned += _learned(card) - was_learned
+        self._due.discard(card.key)     # counted again once its new due time passes
+        self._push(card)
+
+    def remove(self, key: CardKey) -> None:
+        card = self.cards.pop(key)
+        self.learned -= _learned(card)
+        self._due.discard(key)
+
+
+def card_text(content, card: Card) -> Optional[dict]:
+    # {"en": ..., "de": ...}, or None if the lesson content no longer has this item
+    lesson = content.lesson_by_id.get(card.lesson_id)
+    items = lesson.get("content", []) if lesson else []
+    return items[card.item] if card.item < len(items) else None
+
+
+def load_deck(user_id: str) -> Deck:
+    states = get_progress_store().load_cards(user_id)
+    return Deck(Card(lesson_id, item, *state) for (lesson_id, item), state in states.items())
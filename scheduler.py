@@ -0,0 +1,130 @@
+"""Process-wide scheduler in front of the remote translation providers.
+
+Every session's provider calls go through here, which gives three things:
+
+* Coalescing (singleflight): identical translations requested while one is
+  already in flight wait for that call instead of making their own.
+* Per-provider limits: a token bucket for the request rate and a daily
+  character quota (MyMemory's free tier). A provider that reports its quota
+  as gone is not called again until the next UTC day.
+* Priorities: batch work (bulk lists, documents) leaves part of the rate
+  burst and of the daily quota to interactive requests, and waits for rate
+  tokens, where an interactive request gives up after a short wait.
+
+A provider that can't be admitted raises ``ProviderThrottled`` without
+touching the network; the translator then falls back to the other
+providers, the local model and finally the glossary.
+"""
+
+import threading
+from concurrent.futures import Future, TimeoutError
+from typing import Callable, Dict, Hashable, Optional
+
+import metrics
+import providers
+import settings
+from ratelimit import DailyQuota, TokenBucket
+
+INTERACTIVE, BATCH = "interactive", "batch"
+
+
+# ---------- Per-provider limits ----------
+class ProviderLimits:
+    def __init__(self, name: str, rate: float, burst: float, daily_chars: int):
+        self.name = name
+        self.rate = TokenBucket(rate, burst)
+        self.quota = DailyQuota(daily_chars)
+
+    def admit(self, chars: int, priority: str = INTERACTIVE) -> None:
+        # Takes quota and a rate token, or raises ProviderThrottled having taken neither
+        batch = priority == BATCH
+        keep = int(self.quota.limit * settings.SCHEDULER_QUOTA_RESERVE) if batch else 0
+        if not self.quota.try_acquire(chars, keep):
+            metrics.inc(metrics.SCHEDULER, provider=self.name, outcome="throttled_quota", priority=priority)
+            raise providers.ProviderThrottled(f"{self.name} daily quota is used up for {priority} requests")
+        if batch:
+            self.rate.acquire(keep=settings.SCHEDULER_RATE_RESERVE)
+        elif not self.rate.acquire(timeout=settings.SCHEDULER_MAX_WAIT_SECONDS):
+            self.quota.release(chars)
+            metrics.inc(metrics.SCHEDULER, provider=self.name, outcome="throttled_rate", priority=priority)
+            raise providers.ProviderThrottled(f"{self.name} rate limit reached")
+
+
+_limits: Dict[str, ProviderLimits] = {}
+_limits_lock = threading.Lock()
+
+
+def get_limits(name: str) -> ProviderLimits:
+    # One set per provider per process, so every session and batch shares the budget
+    limits = _limits.get(name)
+    if limits is None:
+        with _limits_lock:
+            limits = _limits.get(name)
+            if limits is None:
+                rate, burst = settings.PROVIDER_RATE_LIMITS.get(name, (5, 10))
+                limits = _limits[name] = ProviderLimits(name, rate, burst, settings.PROVIDER_DAILY_CHARS.get(name, 0))
+    return limits
+
+
+def admit(name: str, text: str, priority: str = INTERACTIVE) -> None:
+    # Only remote providers are limited; the local model costs nothing upstream
+    if name in providers.client.breakers:
+        get_limits(name).admit(len(text), priority)
+
+
+def quota_exceeded(name: str) -> None:
+    if name in providers.client.breakers:
+        get_limits(name).quota.exhaust()
+
+
+def _collect_metrics() -> list:
+    with _limits_lock:
+        limits = list(_limits.values())
+    remaining = [(limit.name, limit.quota.remaining()) for limit in limits]
+    return [("lingo_provider_quota_remaining_chars", "gauge", "Characters left in the provider's daily quota.",
+             [({"provider": name}, value) for name, value in remaining if value is not None])]
+
+
+metrics.register_collector(_collect_metrics)
+
+
+# ---------- Coalescing ----------
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable, *args, timeout: Optional[float] = None):
+        # fn(*args) once per key at a time; concurrent callers share its result (or exception).
+        # A follower that waits longer than `timeout` gets None rather than calling upstream again.
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            try:
+                result = future.result(timeout)
+            except TimeoutError:
+                metrics.inc(metrics.SCHEDULER, outcome="coalesce_timeout")
+                return None
+            metrics.inc(metrics.SCHEDULER, outcome="coalesced")
+            return result
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+_flights = SingleFlight()
+
+
+def coalesce(key: Hashable, fn: Callable, *args, timeout: Optional[float] = None):
+    return _flights.do(key, fn, *args, timeout=timeout)
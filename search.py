@@ -0,0 +1,195 @@
+"""Vocabulary search over lesson content and quiz questions.
+
+An inverted index (folded token -> entry ids) is built once per content
+version over every en/de pair and every quiz question with its options.
+Each query token is expanded to the index terms it may mean:
+
+* the term itself;
+* for the last token (the one still being typed), or any token that
+  isn't a term, the terms it is a prefix of (a bisect over the sorted
+  vocabulary);
+* when none of those exist, terms within a small edit distance, found
+  through a trigram (or, for short tokens, bigram) index and then verified with grading's bit-parallel
+  edit distance.
+
+Entries are ranked by how many query tokens they match, then by how many
+of those matched exactly, then by an idf-weighted score that favours exact
+over prefix over fuzzy matches, short entries and entries whose phrase or
+answer (rather than only a quiz option) contains the whole query.
+Folding is textnorm's, so "strasse" finds "Straße" and "schoen" finds
+"schön".
+"""
+
+import bisect
+import heapq
+import math
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from content import get_content
+from grading import edit_distance
+from textnorm import tokenize
+
+MAX_PREFIX_TERMS = 64        # expansions per query token
+PREFIX_WEIGHT = 0.5
+FUZZY_WEIGHT = 0.5           # halved again for each extra edit
+
+
+class SearchHit(NamedTuple):
+    kind: str           # "lesson" or "quiz"
+    ref: int            # lesson_id / quiz_id
+    item: int           # index of the pair / question within it
+    text: str           # English phrase / question
+    detail: str         # German phrase / answer
+    score: float
+
+
+def _grams(term: str, q: int) -> List[str]:
+    padded = f"${term}$"
+    return [padded[i:i + q] for i in range(len(padded) - q + 1)]
+
+
+def _max_edits(term: str) -> int:
+    return 0 if len(term) < 3 else 1 if len(term) <= 5 else 2
+
+
+class SearchIndex:
+    def __init__(self, entries: Iterable[Tuple[str, int, int, str, str, str]]):
+        # entries: (kind, ref, item, text, detail, extra searchable text)
+        self.entries: List[Tuple[str, int, int, str, str]] = []
+        self._folded: List[str] = []             # " token token " of text and detail, for phrase matches
+        self._norms: List[float] = []
+        postings: Dict[str, List[int]] = {}
+        for entry_id, (kind, ref, item, text, detail, extra) in enumerate(entries):
+            primary = [norm for norm, _ in tokenize(f"{text} {detail}")]
+            tokens = primary + [norm for norm, _ in tokenize(extra)]
+            self.entries.append((kind, ref, item, text, detail))
+            self._folded.append(f" {' '.join(primary)} ")
+            self._norms.append(1 / math.sqrt(max(1, len(tokens))))
+            for token in dict.fromkeys(tokens):
+                postings.setdefault(token, []).append(entry_id)
+        self.postings = postings
+        self.terms: List[str] = sorted(postings)
+        total = max(1, len(self.entries))
+        self._idf = {term: math.log(1 + total / len(ids)) for term, ids in postings.items()}
+        # q -> q-gram -> positions in self.terms; bigrams for tokens too short for trigrams to filter
+        self._gram_terms: Dict[int, Dict[str, List[int]]] = {3: {}, 2: {}}
+        self._length_terms: Dict[int, List[int]] = {}      # term length -> positions in self.terms
+        for pos, term in enumerate(self.terms):
+            for q, index in self._gram_terms.items():
+                for gram in set(_grams(term, q)):
+                    index.setdefault(gram, []).append(pos)
+            self._length_terms.setdefault(len(term), []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ---------- Term expansion ----------
+    def _prefixed(self, token: str) -> Iterator[str]:
+        start = bisect.bisect_left(self.terms, token)
+        for term in self.terms[start:start + MAX_PREFIX_TERMS + 1]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                yield term
+
+    def _similar(self, token: str) -> Iterator[Tuple[str, int]]:
+        # Terms within _max_edits(token); a term that close shares at least
+        # len(grams) - q * edits of the token's q-grams (q-gram lemma). Trigrams
+        # when that bound is positive, else bigrams (3- and 6-letter tokens); a
+        # token of repeated letters, for which neither filters, is checked against
+        # every term of a close enough length
+        limit = _max_edits(token)
+        if not limit:
+            return
+        size = len(token)
+        for q, index in self._gram_terms.items():
+            grams = set(_grams(token, q))
+            needed = len(grams) - q * limit
+            if needed > 0:
+                shared: Dict[int, int] = {}
+                for gram in grams:
+                    for pos in index.get(gram, ()):
+                        shared[pos] = shared.get(pos, 0) + 1
+                candidates = [pos for pos, count in shared.items() if count >= needed]
+                break
+        else:
+            candidates = [pos for length in range(size - limit, size + limit + 1)
+                          for pos in self._length_terms.get(length, ())]
+        for pos in candidates:
+            term = self.terms[pos]
+            if abs(len(term) - size) > limit:
+                continue
+            distance = edit_distance(token, term, limit)
+            if distance <= limit:
+                yield term, distance
+
+    def expand(self, token: str, last: bool = True) -> List[Tuple[str, float]]:
+        # (index term, match weight) for one query token
+        matches = []
+        if token in self.postings:
+            matches.append((token, 1.0))
+        if len(token) >= 2 and (last or not matches):
+            matches.extend((term, PREFIX_WEIGHT) for term in self._prefixed(token))
+        if not matches:
+            matches.extend((term, FUZZY_WEIGHT / 2 ** (distance - 1)) for term, distance in self._similar(token))
+        return matches
+
+    # ---------- Querying ----------
+    def search(self, query: str, limit: int = 20) -> List[SearchHit]:
+        tokens = list(dict.fromkeys(norm for norm, _ in tokenize(query)))
+        if not tokens:
+            return []
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        exact: Dict[int, int] = {}
+        for position, token in enumerate(tokens):
+            for entry_id in self.postings.get(token, ()):
+                exact[entry_id] = exact.get(entry_id, 0) + 1
+            best: Dict[int, float] = {}
+            for term, weight in self.expand(token, last=position == len(tokens) - 1):
+                weight *= self._idf[term]
+                for entry_id in self.postings[term]:
+                    if best.get(entry_id, 0.0) < weight:
+                        best[entry_id] = weight
+            for entry_id, weight in best.items():
+                scores[entry_id] = scores.get(entry_id, 0.0) + weight
+                matched[entry_id] = matched.get(entry_id, 0) + 1
+
+        phrase = f" {' '.join(tokens)} "
+
+        def rank(entry_id: int) -> Tuple[int, int, float]:
+            score = scores[entry_id] * self._norms[entry_id]
+            if phrase in self._folded[entry_id]:
+                score *= 2
+            return matched[entry_id], exact.get(entry_id, 0), score
+
+        top = heapq.nlargest(limit, scores, key=rank)
+        return [SearchHit(*self.entries[entry_id], round(rank(entry_id)[2], 4)) for entry_id in top]
+
+
+def content_entries(content) -> Iterator[Tuple[str, int, int, str, str, str]]:
+    for lesson in content.iter_lessons():
+        for item, pair in enumerate(lesson.get("content", [])):
+            yield "lesson", lesson["lesson_id"], item, pair["en"], pair["de"], ""
+    for quiz in content.iter_quizzes():
+        for item, question in enumerate(quiz.get("questions", [])):
+            yield ("quiz", quiz["quiz_id"], item, question["question"], question["answer"],
+                   " ".join(question.get("options", [])))
+
+
+_index: Optional[SearchIndex] = None
+_index_version: Optional[str] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    # Rebuilt only when the content changes
+    global _index, _index_version
+    content = get_content()
+    if content.version != _index_version:
+        with _index_lock:
+            if content.version != _index_version:
+                _index = SearchIndex(content_entries(content))
+                _index_version = content.version
+    return _index
@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+
+# Runtime knobs for the app. Every value can be overridden with a LINGO_*
+# environment variable so deployments don't need code changes.
+
+DATA_DIR = Path(__file__).parent
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_path(name: str, default: Path) -> Path:
+    return Path(os.environ.get(name, default))
+
+
+# ---------- Content ----------
+LESSONS_FILE = _env_path("LINGO_LESSONS_FILE", DATA_DIR / "lessons.json")
+QUIZZES_FILE = _env_path("LINGO_QUIZZES_FILE", DATA_DIR / "quizzes.json")
+CHAT_INTENTS_FILE = _env_path("LINGO_CHAT_INTENTS_FILE", DATA_DIR / "chat_intents.json")
+CONTENT_PACK_DIR = os.environ.get("LINGO_CONTENT_PACK", "")            # tools/build_content_pack.py output; empty = the JSON files
+CONTENT_CACHE_RECORDS = _env_int("LINGO_CONTENT_CACHE_RECORDS", 512)    # parsed pack lessons/quizzes kept in memory
+
+# ---------- Translation cache ----------
+CACHE_MAX_ENTRIES = _env_int("LINGO_CACHE_MAX_ENTRIES", 5000)        # in-process LRU size
+CACHE_TTL_SECONDS = _env_float("LINGO_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+CACHE_DB_PATH = _env_path("LINGO_CACHE_DB", DATA_DIR / "translation_memory.sqlite3")
+CACHE_DB_MAX_ROWS = _env_int("LINGO_CACHE_DB_MAX_ROWS", 200_000)     # on-disk translation memory size
+
+# ---------- Translation providers ----------
+LIBRETRANSLATE_URL = os.environ.get("LINGO_LIBRETRANSLATE_URL", "https://libretranslate.com")
+MYMEMORY_URL = os.environ.get("LINGO_MYMEMORY_URL", "https://api.mymemory.translated.net")
+PROVIDER_POOL_SIZE = _env_int("LINGO_PROVIDER_POOL_SIZE", 10)        # keep-alive connections per provider
+PROVIDER_CONNECT_TIMEOUT = _env_float("LINGO_PROVIDER_CONNECT_TIMEOUT", 3.05)
+PROVIDER_READ_TIMEOUT = _env_float("LINGO_PROVIDER_READ_TIMEOUT", 8)
+PROVIDER_RETRIES = _env_int("LINGO_PROVIDER_RETRIES", 2)
+PROVIDER_BACKOFF = _env_float("LINGO_PROVIDER_BACKOFF", 0.3)         # seconds, doubled per retry
+BREAKER_FAILURES = _env_int("LINGO_BREAKER_FAILURES", 3)             # consecutive failures before opening
+BREAKER_RESET_SECONDS = _env_float("LINGO_BREAKER_RESET_SECONDS", 30)
+
+# ---------- Batch translation ----------
+BATCH_MAX_WORKERS = _env_int("LINGO_BATCH_MAX_WORKERS", 8)
+BATCH_MAX_ITEMS = _env_int("LINGO_BATCH_MAX_ITEMS", 5000)
+PROVIDER_RATE_LIMITS = {                                             # (requests per second, burst)
+    "libretranslate": (_env_float("LINGO_LIBRETRANSLATE_RPS", 5), _env_int("LINGO_LIBRETRANSLATE_BURST", 10)),
+    "mymemory": (_env_float("LINGO_MYMEMORY_RPS", 5), _env_int("LINGO_MYMEMORY_BURST", 10)),
+}
+
+# ---------- Upstream scheduler ----------
+PROVIDER_DAILY_CHARS = {                                             # characters per UTC day; 0 = unlimited
+    "libretranslate": _env_int("LINGO_LIBRETRANSLATE_DAILY_CHARS", 0),
+    "mymemory": _env_int("LINGO_MYMEMORY_DAILY_CHARS", 5000),        # anonymous free tier
+}
+SCHEDULER_RATE_RESERVE = _env_float("LINGO_SCHEDULER_RATE_RESERVE", 2)      # burst tokens batch work leaves for interactive requests
+SCHEDULER_QUOTA_RESERVE = _env_float("LINGO_SCHEDULER_QUOTA_RESERVE", 0.2)  # share of the daily quota batch work may not use
+SCHEDULER_MAX_WAIT_SECONDS = _env_float("LINGO_SCHEDULER_MAX_WAIT_SECONDS", 1)  # interactive wait for a rate token
+
+# ---------- Provider racing ----------
+TRANSLATE_PROVIDERS = [p.strip() for p in os.environ.get("LINGO_TRANSLATE_PROVIDERS", "local,libretranslate,mymemory").split(",") if p.strip()]
+TRANSLATE_BUDGET_SECONDS = _env_float("LINGO_TRANSLATE_BUDGET_SECONDS", 4)   # per-request latency budget
+TRANSLATE_MAX_WORKERS = _env_int("LINGO_TRANSLATE_MAX_WORKERS", 32)          # threads shared by all interactive races
+TRANSLATE_BATCH_MAX_WORKERS = _env_int("LINGO_TRANSLATE_BATCH_MAX_WORKERS", 16)   # separate threads for batch provider calls
+
+# ---------- Local neural model ----------
+LOCAL_MODEL_DIR = os.environ.get("LINGO_LOCAL_MODEL_DIR", "")               # holds en-de/ and de-en/ model dirs
+LOCAL_MODEL_QUANTIZE = _env_bool("LINGO_LOCAL_MODEL_QUANTIZE", True)        # dynamic int8 Linear layers
+LOCAL_MODEL_THREADS = _env_int("LINGO_LOCAL_MODEL_THREADS", 0)              # 0 = torch default
+LOCAL_MODEL_MAX_BATCH = _env_int("LINGO_LOCAL_MODEL_MAX_BATCH", 16)
+LOCAL_MODEL_MAX_WAIT_MS = _env_float("LINGO_LOCAL_MODEL_MAX_WAIT_MS", 10)   # how long to gather a micro-batch
+LOCAL_MODEL_MAX_NEW_TOKENS = _env_int("LINGO_LOCAL_MODEL_MAX_NEW_TOKENS", 128)
+
+# ---------- UI ----------
+USE_FRAGMENTS = _env_bool("LINGO_FRAGMENTS", True)           # 0 = rerun the whole script on every interaction
+SHOW_TIMINGS = _env_bool("LINGO_SHOW_TIMINGS", False)        # per-interaction server time in the sidebar
+LESSONS_PAGE_SIZE = _env_int("LINGO_LESSONS_PAGE_SIZE", 20)   # lessons per page in the browsers
+QUIZGEN_QUESTIONS = _env_int("LINGO_QUIZGEN_QUESTIONS", 10)   # questions per generated practice quiz
+RENDER_CACHE_BLOCKS = _env_int("LINGO_RENDER_CACHE_BLOCKS", 4096)   # prebuilt markdown blocks kept per process
+
+# ---------- Chat history ----------
+CHAT_MAX_TURNS = _env_int("LINGO_CHAT_MAX_TURNS", 200)      # in-memory turns per session
+CHAT_WINDOW = _env_int("LINGO_CHAT_WINDOW", 20)             # turns rendered per "load earlier" step
+CHAT_SPILL_DIR = os.environ.get("LINGO_CHAT_SPILL_DIR", "")  # empty = drop turns beyond the cap
+CHAT_SPILL_MAX_AGE_S = _env_float("LINGO_CHAT_SPILL_MAX_AGE_S", 24 * 3600)   # spill files idle this long are deleted
+
+# ---------- Progress store ----------
+PROGRESS_BACKEND = os.environ.get("LINGO_PROGRESS_BACKEND", "sqlite")     # see progress_store.BACKENDS
+PROGRESS_DB_PATH = _env_path("LINGO_PROGRESS_DB", DATA_DIR / "progress.sqlite3")
+PROGRESS_FLUSH_SECONDS = _env_float("LINGO_PROGRESS_FLUSH_SECONDS", 2)
+PROGRESS_FLUSH_BATCH = _env_int("LINGO_PROGRESS_FLUSH_BATCH", 500)
+
+# ---------- Startup ----------
+WARMUP = _env_bool("LINGO_WARMUP", True)                          # preload content and caches in the background
+WARMUP_LOCAL_MODEL = _env_bool("LINGO_WARMUP_LOCAL_MODEL", False)  # also load the local models (slow, memory-heavy)
+
+# ---------- Instrumentation ----------
+METRICS = _env_bool("LINGO_METRICS", False)                    # counters, histograms and spans; off = no-ops
+METRICS_FILE = os.environ.get("LINGO_METRICS_FILE", "")        # Prometheus text file, rewritten periodically
+METRICS_FILE_SECONDS = _env_float("LINGO_METRICS_FILE_SECONDS", 15)
+METRICS_PORT = _env_int("LINGO_METRICS_PORT", 0)               # serve /metrics on this port; 0 = off
+METRICS_LOG = os.environ.get("LINGO_METRICS_LOG", "")          # JSON lines per span/error: a path, or "-" for stderr
+
+# ---------- Document translation ----------
+DOCUMENT_MAX_CHARS = _env_int("LINGO_DOCUMENT_MAX_CHARS", 400)      # per request; MyMemory rejects > 500 bytes
+DOCUMENT_MAX_WORKERS = _env_int("LINGO_DOCUMENT_MAX_WORKERS", 4)    # concurrent sentence translations
+DOCUMENT_WINDOW = _env_int("LINGO_DOCUMENT_WINDOW", 16)             # segments translated ahead of the output
+DOCUMENT_RENDER_SEGMENTS = _env_int("LINGO_DOCUMENT_RENDER_SEGMENTS", 8)   # segments per rendered block
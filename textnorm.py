@@ -0,0 +1,30 @@
+import re
+from typing import List, Tuple
+
+# Normalization shared by the glossary, search and grading:
+# case-insensitive, apostrophe variants unified, umlauts/ß folded
+# (ä -> ae, ß -> ss) and punctuation dropped.
+
+_APOSTROPHES = str.maketrans({c: "'" for c in "’‘ʼ´`"})
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_TOKEN_RE = re.compile(r"[\w']+")
+
+
+def fold(text: str) -> str:
+    # casefold() already turns ß into ss; the table covers ä/ö/ü
+    return text.translate(_APOSTROPHES).casefold().translate(_UMLAUTS)
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    # (normalized token, original surface text) pairs; punctuation is dropped
+    text = text.translate(_APOSTROPHES)
+    tokens = []
+    for m in _TOKEN_RE.finditer(text):
+        norm = fold(m.group()).replace("'", "")   # "geht's" == "gehts"
+        if norm:
+            tokens.append((norm, m.group()))
+    return tokens
+
+
+def normalize(text: str) -> str:
+    return " ".join(norm for norm, _ in tokenize(text))
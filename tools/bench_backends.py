@@ -0,0 +1,297 @@
+"""Translation backend comparison: latency, throughput and accuracy on the lesson corpus.
+
+    python tools/bench_backends.py [--backends glossary,libretranslate,mymemory,local,pipeline]
+                                   [--concurrency 1,4,16] [--folds 5] [--limit 0]
+                                   [--lessons lessons.json] [--quizzes quizzes.json]
+                                   [--live [--record responses.json] | --replay responses.json]
+                                   [--stub-latency 0.05] [--stub-error-rate 0.0]
+                                   [--out bench_backends.json]
+
+The reference set is every en/de pair in the lessons, in both directions,
+plus every "How do you say '...' in German?" quiz question with its answer.
+Each backend translates the whole set once per concurrency level:
+
+* ``glossary``: the local dictionary (exact lookups);
+* every provider in ``providers.PROVIDERS`` (``local`` when
+  LINGO_LOCAL_MODEL_DIR is set), called directly, without the scheduler's
+  rate limits;
+* ``pipeline``: ``translator.translate`` with its fallbacks, the translation
+  cache cleared before each level. It runs under the app's scheduler, so
+  the provider rate limits (LINGO_*_RPS) bound its throughput as they
+  would in production.
+
+The glossary is built from the same lessons, so the set is split into
+``--folds`` folds and each fold is translated by an app whose lessons leave
+out every item that appears in it (as source or answer): the glossary and
+the pipeline only ever see phrases they weren't built from. Only LOCAL_DICT,
+which isn't lesson content, stays complete.
+
+Per backend and level it reports latency percentiles, throughput, the share
+of answers that match the reference exactly and after textnorm
+normalisation, and the fallback rate: requests the backend answered with an
+error or not at all, which the pipeline would pass on to the next stage. For
+``pipeline`` the stage that produced each answer is counted instead (from
+the translations metric).
+
+By default the remote providers are local stub servers (tools/stub_translate.py),
+one per provider. ``--replay`` makes them answer with responses recorded by
+an earlier ``--live --record`` run, so accuracy can be compared offline;
+without a recording they answer ``"[de] <text>"`` and only the latency and
+fallback figures mean anything.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(ROOT))
+
+from stub_translate import StubTranslationServer  # noqa: E402
+from textnorm import normalize  # noqa: E402
+
+REMOTE = ("libretranslate", "mymemory")
+QUIZ_QUESTION = re.compile(r"^How do you say '(.+)' in German\?$")
+
+
+def reference_set(lessons, quizzes):
+    # (source text, target language, expected translation)
+    cases = []
+    for lesson in lessons:
+        for pair in lesson.get("content", []):
+            cases.append((pair["en"], "de", pair["de"]))
+            cases.append((pair["de"], "en", pair["en"]))
+    for quiz in quizzes:
+        for question in quiz.get("questions", []):
+            m = QUIZ_QUESTION.match(question["question"])
+            if m:
+                cases.append((m.group(1), "de", question["answer"]))
+    return cases
+
+
+def training_lessons(lessons, held_out):
+    # The lessons without any item whose en or de text is a source or answer of the held-out cases
+    held = {normalize(text) for text, _, expected in held_out for text in (text, expected)}
+    return [
+        {**lesson, "content": [item for item in lesson.get("content", [])
+                               if normalize(item["en"]) not in held and normalize(item["de"]) not in held]}
+        for lesson in lessons
+    ]
+
+
+def write_lessons(path: Path, lessons, generation: int) -> None:
+    # The app reloads content when the file's mtime/size changes; make sure the mtime does
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(lessons, f, ensure_ascii=False)
+    stamp = time.time_ns() + generation
+    os.utime(path, ns=(stamp, stamp))
+
+
+def load_recording(path):
+    # provider -> {(text, target): translation}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: {(text, target): out for text, target, out in rows} for name, rows in data.items()}
+
+
+def backend_call(name):
+    # text, target -> (translation or None, outcome or None when the pipeline's metrics tell it)
+    import providers
+    import translator
+    from glossary import get_glossary
+
+    if name == "glossary":
+        def call(text, target):
+            found = get_glossary().lookup(text, target)
+            return found, "ok" if found is not None else "miss"
+    elif name == "pipeline":
+        def call(text, target):
+            translated = translator.translate(text, target)
+            return (None if translated == translator.NOT_FOUND else translated), None
+    else:
+        provider = providers.PROVIDERS[name]
+
+        def call(text, target):
+            try:
+                return provider(text, target), "ok"
+            except providers.ProviderError as e:
+                return None, type(e).__name__
+    return call
+
+
+def translation_sources():
+    # Pipeline stage -> translations so far, from the app's metrics
+    import metrics
+    return Counter({dict(labels)["source"]: value for _, labels, value in metrics.TRANSLATIONS.samples()})
+
+
+def run_cases(call, cases, concurrency):
+    # ([(translation, outcome, seconds)], wall seconds)
+    def one(case):
+        text, target, _ = case
+        start = time.perf_counter()
+        translated, outcome = call(text, target)
+        return translated, outcome, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, cases))
+    return results, time.perf_counter() - start
+
+
+def summarize(name, concurrency, cases, results, wall, outcomes, recording):
+    latencies = sorted(seconds for _, _, seconds in results)
+    exact = normalized = answered = 0
+    for (text, target, expected), (translated, _, _) in zip(cases, results):
+        if translated is None:
+            continue
+        answered += 1
+        exact += translated.strip() == expected
+        normalized += normalize(translated) == normalize(expected)
+        if recording is not None:
+            recording.setdefault(name, {})[(text, target)] = translated
+    count = len(cases)
+    quantile = lambda q: latencies[min(count - 1, int(q * count))] * 1000  # noqa: E731
+    return {
+        "concurrency": concurrency,
+        "requests": count,
+        "latency_ms": {"p50": quantile(0.50), "p90": quantile(0.90), "p99": quantile(0.99),
+                       "mean": statistics.fmean(latencies) * 1000},
+        "throughput_rps": count / wall if wall else 0.0,
+        "exact": exact / count,
+        "normalized": normalized / count,
+        "fallback": (count - answered) / count if name != "pipeline" else None,
+        "outcomes": dict(outcomes),
+    }
+
+
+def print_report(report):
+    print(f"{'backend':<16}{'conc':>5}{'p50 ms':>9}{'p90':>9}{'p99':>9}{'req/s':>9}"
+          f"{'exact':>8}{'norm':>8}{'fallbk':>8}  outcomes")
+    for name, levels in report["backends"].items():
+        for r in levels:
+            fallback = f"{r['fallback']:>8.1%}" if r["fallback"] is not None else f"{'-':>8}"
+            outcomes = ", ".join(f"{k} {v:g}" for k, v in sorted(r["outcomes"].items(), key=lambda kv: -kv[1]))
+            print(f"{name:<16}{r['concurrency']:>5}{r['latency_ms']['p50']:>9.2f}{r['latency_ms']['p90']:>9.2f}"
+                  f"{r['latency_ms']['p99']:>9.2f}{r['throughput_rps']:>9.1f}{r['exact']:>8.1%}"
+                  f"{r['normalized']:>8.1%}{fallback}  {outcomes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default="glossary,libretranslate,mymemory,local,pipeline",
+                        help="comma-separated; unavailable ones are skipped")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated worker counts")
+    parser.add_argument("--folds", type=int, default=5, help="hold-out folds for the glossary and pipeline (>= 2)")
+    parser.add_argument("--limit", type=int, default=0, help="use only the first N reference cases")
+    parser.add_argument("--lessons", default=str(ROOT / "lessons.json"))
+    parser.add_argument("--quizzes", default=str(ROOT / "quizzes.json"))
+    parser.add_argument("--live", action="store_true", help="call the real provider URLs from settings")
+    parser.add_argument("--record", help="with --live: save the providers' answers here for --replay")
+    parser.add_argument("--replay", help="stub servers answer with these recorded responses")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="seconds per stub response")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="share of stub requests failing")
+    parser.add_argument("--out", default="bench_backends.json", help="where to write the JSON report")
+    args = parser.parse_args()
+    if args.record and not args.live:
+        parser.error("--record needs --live")
+    if args.folds < 2:
+        parser.error("--folds must be at least 2")
+
+    with open(args.lessons, "r", encoding="utf-8") as f:
+        lessons = json.load(f)
+    with open(args.quizzes, "r", encoding="utf-8") as f:
+        quizzes = json.load(f)["quizzes"]
+    cases = reference_set(lessons, quizzes)
+    if args.limit:
+        cases = cases[:args.limit]
+    folds = [cases[i::args.folds] for i in range(args.folds)]
+
+    recorded = load_recording(args.replay) if args.replay else {}
+    stubs = [] if args.live else [
+        StubTranslationServer(latency=args.stub_latency, error_rate=args.stub_error_rate,
+                              pairs=recorded.get(name), seed=n).start()
+        for n, name in enumerate(REMOTE)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        lessons_file = Path(tmp) / "lessons.json"
+        write_lessons(lessons_file, training_lessons(lessons, folds[0]), 0)
+        # Must be set before the app modules import settings
+        os.environ.update({
+            "LINGO_LESSONS_FILE": str(lessons_file),
+            "LINGO_QUIZZES_FILE": str(Path(args.quizzes).resolve()),
+            "LINGO_CONTENT_PACK": "",
+            "LINGO_CACHE_DB": str(Path(tmp) / "translation_memory.sqlite3"),
+            "LINGO_METRICS": "1",       # counters only: the pipeline's stage counts come from them
+        })
+        if stubs:
+            os.environ["LINGO_LIBRETRANSLATE_URL"] = stubs[0].url
+            os.environ["LINGO_MYMEMORY_URL"] = stubs[1].url
+        import local_model
+        import providers
+        from translation_cache import get_translation_cache
+
+        local_model.register_provider()
+        levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+        names = [n.strip() for n in args.backends.split(",") if n.strip()]
+        names = [n for n in names if n in ("glossary", "pipeline") or n in providers.PROVIDERS]
+        recording = {} if args.record else None
+        print(f"{len(cases)} reference cases in {args.folds} held-out folds, backends: {', '.join(names)}, "
+              f"{'live providers' if args.live else 'stub providers' + (' (replaying)' if args.replay else '')}")
+
+        # (backend, level) -> [cases, results, wall seconds, outcomes], accumulated over the folds
+        runs = {(name, level): [[], [], 0.0, Counter()] for name in names for level in levels}
+        calls = {name: backend_call(name) for name in names}
+        for n, fold in enumerate(folds):
+            if n:
+                write_lessons(lessons_file, training_lessons(lessons, fold), n)
+            for name in names:
+                for level in levels:
+                    if name == "pipeline":
+                        get_translation_cache().clear()
+                        before = translation_sources()
+                    results, wall = run_cases(calls[name], fold, level)
+                    run = runs[(name, level)]
+                    run[0] += fold
+                    run[1] += results
+                    run[2] += wall
+                    if name == "pipeline":
+                        run[3] += translation_sources() - before
+                    else:
+                        run[3].update(outcome for _, outcome, _ in results)
+        get_translation_cache().clear()
+
+        report = {"meta": {"cases": len(cases), "folds": args.folds, "live": args.live, "replay": args.replay,
+                           "stub_latency_s": None if args.live else args.stub_latency,
+                           "stub_error_rate": None if args.live else args.stub_error_rate,
+                           "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+                  "backends": {}}
+        for (name, level), (run_cases_, results, wall, outcomes) in runs.items():
+            record_into = recording if name in REMOTE else None
+            report["backends"].setdefault(name, []).append(
+                summarize(name, level, run_cases_, results, wall, outcomes, record_into))
+    for stub in stubs:
+        stub.stop()
+
+    print_report(report)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.out}")
+    if recording is not None:
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump({name: [[text, target, out] for (text, target), out in answers.items()]
+                       for name, answers in recording.items()}, f, ensure_ascii=False, indent=1)
+        print(f"responses recorded to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
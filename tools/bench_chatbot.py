@@ -0,0 +1,80 @@
+"""Chatbot intent matching: regression check + micro-benchmark.
+
+    python tools/bench_chatbot.py
+
+Fails (exit 1) if any message in chat_regression.json maps to a different
+intent. Then times the compiled matcher against the old style sequential
+``any(word in text ...)`` scan, for growing message lengths and intent counts.
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import chatbot  # noqa: E402
+from chatbot import IntentMatcher  # noqa: E402
+
+
+def check_regressions(matcher):
+    with open(ROOT / "tools" / "chat_regression.json", "r", encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+    failures = []
+    for case in cases:
+        intent = matcher.match(case["message"])
+        got = intent.name if intent else None
+        if got != case["intent"]:
+            failures.append((case["message"], case["intent"], got))
+    for message, expected, got in failures:
+        print(f"FAIL {message!r}: expected {expected}, got {got}")
+    print(f"regressions: {len(cases) - len(failures)}/{len(cases)} ok")
+    return not failures
+
+
+def sequential_scan(intents, message):
+    # The pre-compiled-matcher approach: every keyword of every rule, in order
+    text = message.lower()
+    for spec in intents:
+        if any(kw.rstrip("*") in text for kw in spec["keywords"]):
+            return spec["name"]
+    return None
+
+
+def scaled_intents(intents, factor):
+    # Extra synthetic intents (never matching) to show cost vs. rule count
+    extra = [
+        {"name": f"x{i}", "priority": 10_000 + i, "response": "",
+         "keywords": [f"zzq{i}k{j}" for j in range(5)]}
+        for i in range(len(intents) * (factor - 1))
+    ]
+    return intents + extra
+
+
+def benchmark(data):
+    # Worst case for the scan: a long message that matches nothing
+    base = "das wetter ist heute sehr schoen und warm "
+    print(f"{'intents':>8}{'chars':>8}{'compiled us':>14}{'sequential us':>16}")
+    for factor in (1, 10):
+        intents = scaled_intents(data["intents"], factor)
+        matcher = IntentMatcher(intents, data["default_responses"])
+        for repeat in (1, 10, 100):
+            message = base * repeat
+            n = max(10, 2000 // repeat)
+            compiled = timeit.timeit(lambda: matcher.match(message), number=n) / n * 1e6
+            sequential = timeit.timeit(lambda: sequential_scan(intents, message), number=n) / n * 1e6
+            print(f"{len(intents):>8}{len(message):>8}{compiled:>14.1f}{sequential:>16.1f}")
+
+
+def main():
+    with open(ROOT / "chat_intents.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    ok = check_regressions(chatbot.load_matcher())
+    benchmark(data)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
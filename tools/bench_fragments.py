@@ -0,0 +1,61 @@
+"""Per-interaction server time: full-script rerun vs. fragment rerun.
+
+    python tools/bench_fragments.py [rounds]
+
+Drives main.py headlessly with AppTest. AppTest always executes the whole
+script, so every interaction records both the full-script time (what each
+click cost before fragments) and the time of the fragment that owns the
+widget (what a fragment-scoped rerun costs now).
+"""
+
+import statistics
+import sys
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+APP = str(Path(__file__).resolve().parent.parent / "main.py")
+
+
+def open_page(page):
+    at = AppTest.from_file(APP, default_timeout=30)
+    at.run()
+    at.sidebar.selectbox[0].select(page).run()
+    return at
+
+
+def interact_quiz(at):
+    at.main.button[0].click().run()
+
+
+def interact_chat(at):
+    at.text_input[0].input("Hallo, wie geht's?")
+    at.button[0].click().run()
+
+
+def interact_lessons(at):
+    at.button(key="exp_complete_1").click().run()
+
+
+SCENARIOS = {
+    "Quiz": (interact_quiz, "fragment:quiz_questions"),
+    "Chatbot": (interact_chat, "fragment:chat_panel"),
+    "Lessons": (interact_lessons, "fragment:lesson_complete_button"),
+}
+
+
+def main(rounds):
+    print(f"{'page':<10}{'full rerun ms':>16}{'fragment ms':>14}{'ratio':>8}")
+    for page, (interact, region) in SCENARIOS.items():
+        at = open_page(page)
+        at.session_state["_timings"] = {}
+        for _ in range(rounds):
+            interact(at)
+        timings = at.session_state["_timings"]
+        full = statistics.median(timings["script"]) * 1000
+        frag = statistics.median(timings[region]) * 1000
+        print(f"{page:<10}{full:>16.2f}{frag:>14.2f}{full / frag:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
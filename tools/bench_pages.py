@@ -0,0 +1,280 @@
+"""Per-page rerun benchmark: every page, driven headlessly with AppTest.
+
+    python tools/bench_pages.py [--out bench_pages.json] [--chat-messages 200]
+                                [--compare previous.json]
+
+Visits each page from the sidebar and runs scripted interactions (marking
+lessons complete, single and batch translations, submitting every quiz
+answer, grading review cards, a long chat, resetting and importing
+progress). Each rerun is recorded twice, in separate passes: wall time with
+tracemalloc off, then the tracemalloc allocation peak. Translations go to a local stub server
+(tools/stub_translate.py), progress to the in-memory backend and the
+translation memory to a temporary file, so nothing touches the network or
+the real databases.
+
+The JSON report keeps the summary per scenario plus the environment it was
+taken in; ``--compare`` prints the change against an earlier report.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = str(ROOT / "main.py")
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stub_translate import StubTranslationServer  # noqa: E402
+
+PAGES = ["Home", "Lessons", "Search", "Translator", "Quiz", "Review", "Chatbot", "Progress", "Export"]
+
+
+class Recorder:
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.samples = defaultdict(list)     # scenario -> [(wall s, script s, peak bytes)]
+
+    def run(self, at, scenario: str) -> None:
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        at.run()
+        wall = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - base if self.trace_memory else 0
+        if at.exception:
+            raise RuntimeError(f"{scenario}: {at.exception[0].message}")
+        script = at.session_state["_timings"]["script"][-1] if "_timings" in at.session_state else 0.0
+        self.samples[scenario].append((wall, script, peak))
+
+
+def new_app():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    return at
+
+
+def open_page(rec, at, page, scenario=None):
+    at.sidebar.selectbox[0].select(page)
+    rec.run(at, scenario or f"navigate:{page}")
+
+
+# ---------- Scenarios ----------
+def bench_navigation(rec, rounds):
+    at = new_app()
+    for _ in range(rounds):
+        for page in PAGES:
+            open_page(rec, at, page)
+
+
+def bench_lessons(rec, content):
+    at = new_app()
+    open_page(rec, at, "Lessons")
+    for lesson_id in sorted(content.lesson_ids):
+        at.button(key=f"exp_complete_{lesson_id}").click()
+        rec.run(at, "lessons:complete")
+
+
+def bench_translator(rec, content, tag, count):
+    at = new_app()
+    open_page(rec, at, "Translator")
+    known = [item["en"] for lesson in content.lessons for item in lesson.get("content", [])]
+    for i in range(count):
+        # Alternate glossary hits with sentences only the (stub) providers know
+        text = known[i % len(known)] if i % 2 == 0 else f"{tag} sentence number {i}"
+        at.text_input(key="translator_input").input(text)
+        at.button[0].click()
+        rec.run(at, "translator:translate")
+    at.text_area(key="batch_input").input("\n".join(f"{tag} batch line {i}" for i in range(count)))
+    at.button[1].click()
+    rec.run(at, "translator:batch")
+
+
+def bench_quiz(rec, content):
+    at = new_app()
+    open_page(rec, at, "Quiz")
+    for label in content.quiz_labels:
+        quiz = content.quiz_by_id[content.quiz_label_to_id[label]]
+        at.main.selectbox[0].select(label)
+        rec.run(at, "quiz:select")
+        for idx, question in enumerate(quiz["questions"], 1):
+            at.radio(key=f"q{quiz['quiz_id']}_{idx}").set_value(question["answer"])
+            at.button(key=f"submit_{quiz['quiz_id']}_{idx}").click()
+            rec.run(at, "quiz:submit")
+
+
+def bench_review(rec, content, cards):
+    at = new_app()
+    open_page(rec, at, "Progress")
+    at.button[1].click()
+    rec.run(at, "progress:mark_all")
+    open_page(rec, at, "Review")
+    for i in range(cards):
+        at.button(key="review_show").click()
+        rec.run(at, "review:show")
+        at.button(key=f"review_grade_{(1, 3, 4, 5)[i % 4]}").click()
+        rec.run(at, "review:grade")
+
+
+def bench_chat(rec, messages):
+    at = new_app()
+    open_page(rec, at, "Chatbot")
+    for message in messages:
+        at.text_input[0].input(message)
+        at.button[0].click()
+        rec.run(at, "chat:send")
+
+
+def bench_progress(rec, content):
+    at = new_app()
+    open_page(rec, at, "Progress")
+    at.button[1].click()
+    rec.run(at, "progress:mark_all")
+    at.button[0].click()
+    rec.run(at, "progress:reset")
+
+    open_page(rec, at, "Export")
+    upload = json.dumps({"completed": sorted(content.lesson_ids) + [9999]}).encode("utf-8")
+    at.file_uploader[0].set_value(("progress.json", upload, "application/json"))
+    rec.run(at, "export:import")
+
+
+def run_pass(trace_memory, tag, args, content, chat_messages):
+    rec = Recorder(trace_memory)
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        bench_navigation(rec, args.rounds)
+        bench_lessons(rec, content)
+        bench_translator(rec, content, tag, args.translations)
+        bench_quiz(rec, content)
+        bench_review(rec, content, args.reviews)
+        bench_chat(rec, chat_messages)
+        bench_progress(rec, content)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return rec.samples
+
+
+# ---------- Report ----------
+def summarize(values, scale, total=True):
+    values = sorted(v * scale for v in values)
+    summary = {
+        "median": round(statistics.median(values), 3),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+        "max": round(values[-1], 3),
+    }
+    if total:
+        summary["total"] = round(sum(values), 3)
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def build_report(timed, traced, stub, args):
+    import streamlit
+
+    scenarios = {}
+    for name, samples in timed.items():
+        peaks = [peak for _, _, peak in traced.get(name, [])]
+        scenarios[name] = {
+            "runs": len(samples),
+            "wall_ms": summarize([wall for wall, _, _ in samples], 1000),
+            "script_ms": summarize([script for _, script, _ in samples], 1000),
+            "peak_kib": summarize(peaks, 1 / 1024, total=False) if peaks else None,
+        }
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "fragments": os.environ.get("LINGO_FRAGMENTS", "1"),
+            "chat_messages": args.chat_messages,
+            "translations": args.translations,
+            "stub_latency_s": args.stub_latency,
+            "stub_requests": stub.requests,
+        },
+        "scenarios": scenarios,
+    }
+
+
+def print_report(report, baseline=None):
+    header = f"{'scenario':<24}{'runs':>6}{'wall ms p50':>13}{'p95':>9}{'script ms':>11}{'peak KiB':>10}"
+    print(header + ("    vs baseline (wall p50)" if baseline else ""))
+    for name, s in report["scenarios"].items():
+        peak = s["peak_kib"]["median"] if s["peak_kib"] else 0
+        line = (f"{name:<24}{s['runs']:>6}{s['wall_ms']['median']:>13.2f}{s['wall_ms']['p95']:>9.2f}"
+                f"{s['script_ms']['median']:>11.2f}{peak:>10.1f}")
+        old = (baseline or {}).get("scenarios", {}).get(name)
+        if old:
+            line += f"    {old['wall_ms']['median']:>8.2f} -> {(s['wall_ms']['median'] / old['wall_ms']['median'] - 1) * 100:+.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="bench_pages.json", help="where to write the JSON report")
+    parser.add_argument("--compare", help="earlier report to compare against")
+    parser.add_argument("--rounds", type=int, default=5, help="visits per page")
+    parser.add_argument("--chat-messages", type=int, default=200)
+    parser.add_argument("--translations", type=int, default=20)
+    parser.add_argument("--reviews", type=int, default=40, help="review cards to grade")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="seconds per stub response")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, StubTranslationServer(latency=args.stub_latency) as stub:
+        # Must be set before the app imports settings
+        os.environ.update({
+            "LINGO_LIBRETRANSLATE_URL": stub.url,
+            "LINGO_MYMEMORY_URL": stub.url,
+            "LINGO_TRANSLATE_PROVIDERS": "libretranslate,mymemory",
+            "LINGO_LOCAL_MODEL_DIR": "",
+            "LINGO_CACHE_DB": str(Path(tmp) / "translation_memory.sqlite3"),
+            "LINGO_PROGRESS_BACKEND": "memory",
+            "LINGO_CHAT_SPILL_DIR": "",
+            "LINGO_WARMUP": "0",
+        })
+        sys.path.insert(0, str(ROOT))
+        from content import get_content
+
+        content = get_content()
+        with open(ROOT / "tools" / "chat_regression.json", "r", encoding="utf-8") as f:
+            phrases = [case["message"] for case in json.load(f)["cases"]]
+        chat_messages = [phrases[i % len(phrases)] for i in range(args.chat_messages)]
+
+        timed = run_pass(False, "timed", args, content, chat_messages)
+        traced = run_pass(True, "traced", args, content, chat_messages)
+        report = build_report(timed, traced, stub, args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Convert lessons and quizzes into a content pack (see content.py).
+
+    python tools/build_content_pack.py --out content_pack
+        [--lessons lessons.json] [--quizzes quizzes.json] [--shard-size 1000]
+
+Inputs are the app's JSON files (a list of lessons; {"quizzes": [...]}) or
+.jsonl files with one record per line. The new shards and indexes get a
+fresh build id, the manifest is replaced atomically last, and files of
+earlier builds are removed afterwards, so a running app that watches the
+pack (LINGO_CONTENT_PACK) never reads a half-written one.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from content import INDEX_RECORD, MANIFEST, PACK_FORMAT  # noqa: E402
+
+
+def read_records(path: Path, key: str = "") -> Iterator[dict]:
+    if path.suffix == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        yield from (data[key] if key and isinstance(data, dict) else data)
+
+
+def write_kind(out: Path, build: str, kind: str, records: Iterable[dict], id_field: str,
+               size_field: str, shard_size: int) -> dict:
+    # Writes the shards and the index of one record kind; returns its manifest entry
+    shards, catalog, index, seen = [], [], [], set()
+    f = None
+    for n, record in enumerate(records):
+        record_id = record[id_field]
+        if record_id in seen:
+            raise SystemExit(f"duplicate {id_field} {record_id}")
+        seen.add(record_id)
+        if n % shard_size == 0:
+            if f is not None:
+                f.close()
+            shards.append(f"{kind}-{build}-{len(shards):04d}.jsonl")
+            f = open(out / shards[-1], "wb")
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        index.append((record_id, len(shards) - 1, f.tell(), len(line)))
+        f.write(line + b"\n")
+        catalog.append([record_id, record.get("title", ""), len(record.get(size_field, []))])
+    if f is not None:
+        f.close()
+    index_name = f"{kind}-{build}.idx"
+    with open(out / index_name, "wb") as f:
+        for entry in sorted(index):
+            f.write(INDEX_RECORD.pack(*entry))
+    return {"shards": shards, "index": index_name, "catalog": catalog}
+
+
+def remove_stale(out: Path, keep: List[str]) -> int:
+    removed = 0
+    for path in out.iterdir():
+        if path.name not in keep and path.name.startswith(("lessons-", "quizzes-")) and path.suffix in (".jsonl", ".idx"):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="pack directory (created if missing)")
+    parser.add_argument("--lessons", default=str(ROOT / "lessons.json"))
+    parser.add_argument("--quizzes", default=str(ROOT / "quizzes.json"))
+    parser.add_argument("--shard-size", type=int, default=1000, help="records per shard")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    build = time.strftime("%Y%m%d%H%M%S") + f"{os.getpid() % 10000:04d}"
+    start = time.perf_counter()
+    manifest = {
+        "format": PACK_FORMAT,
+        "build": build,
+        "lessons": write_kind(out, build, "lessons", read_records(Path(args.lessons)),
+                              "lesson_id", "content", args.shard_size),
+        "quizzes": write_kind(out, build, "quizzes", read_records(Path(args.quizzes), "quizzes"),
+                              "quiz_id", "questions", args.shard_size),
+    }
+    tmp = out / f"{MANIFEST}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, out / MANIFEST)
+
+    keep = [MANIFEST]
+    for kind in ("lessons", "quizzes"):
+        keep += manifest[kind]["shards"] + [manifest[kind]["index"]]
+    removed = remove_stale(out, keep)
+    print(f"{len(manifest['lessons']['catalog'])} lessons, {len(manifest['quizzes']['catalog'])} quizzes "
+          f"-> {out} (build {build}, {time.perf_counter() - start:.2f}s, {removed} stale files removed)")
+
+
+if __name__ == "__main__":
+    main()
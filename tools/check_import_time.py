@@ -0,0 +1,93 @@
+"""Cold-start import budget.
+
+    python tools/check_import_time.py [--runs N] [--scale X]
+
+Imports what main.py imports at the top, and then each page module on top
+of that, in fresh interpreters under ``python -X importtime``. Exits 1 when
+a scenario's median import time is over its budget in
+tools/import_budget.json (multiplied by --scale, or LINGO_IMPORT_BUDGET_SCALE,
+for slower machines) or when it pulls in a module it must not load, such
+as torch on startup.
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "import_budget.json"
+
+
+def startup_modules():
+    # Modules imported at the top level of main.py
+    tree = ast.parse((ROOT / "main.py").read_text(encoding="utf-8"))
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def measure(modules):
+    # (total import time in ms, {module: cumulative ms}) for one fresh interpreter
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"importing {modules} failed:\n{proc.stderr[-2000:]}")
+    loaded = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        loaded[name.strip()] = int(cumulative) / 1000
+        if depth == 0:
+            total += int(cumulative) / 1000
+    return total, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=None, help="runs per scenario (median is used)")
+    parser.add_argument("--scale", type=float, default=float(os.environ.get("LINGO_IMPORT_BUDGET_SCALE", 1)))
+    args = parser.parse_args()
+
+    config = json.loads(BUDGET_FILE.read_text(encoding="utf-8"))
+    runs = args.runs or config["runs"]
+    startup = startup_modules()
+
+    failures = []
+    print(f"{'scenario':<18}{'median ms':>11}{'budget ms':>11}")
+    for scenario, spec in config["scenarios"].items():
+        modules = startup if scenario == "startup" else startup + [scenario]
+        results = [measure(modules) for _ in range(runs)]
+        median = statistics.median(total for total, _ in results)
+        budget = spec["budget_ms"] * args.scale
+        loaded = results[0][1]
+        print(f"{scenario:<18}{median:>11.1f}{budget:>11.1f}")
+
+        if median > budget:
+            slowest = sorted(((ms, name) for name, ms in loaded.items() if "." not in name), reverse=True)[:5]
+            failures.append(f"{scenario}: {median:.1f} ms > {budget:.1f} ms budget; slowest: "
+                            + ", ".join(f"{name} {ms:.0f} ms" for ms, name in slowest))
+        forbidden = sorted(set(spec.get("forbidden", [])) & set(loaded))
+        if forbidden:
+            failures.append(f"{scenario}: imports {', '.join(forbidden)}")
+
+    for failure in failures:
+        print("FAIL " + failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
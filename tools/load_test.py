@@ -0,0 +1,348 @@
+"""Multi-session load test: how many learners can one app process serve?
+
+    python tools/load_test.py [--sessions 1,5,10,25] [--duration 30]
+                              [--stub-latency 0.2] [--stub-error-rate 0.05]
+                              [--think-time 1.0] [--out load_test.json]
+
+Starts ``streamlit run main.py`` on a free port, pointed at a local stub
+translation server (tools/stub_translate.py), then for each session count
+opens that many websocket sessions and lets each one behave like a learner
+for ``--duration`` seconds: switching pages, translating, answering quiz
+questions and chatting, with random think time in between. Sessions speak
+the browser's protocol (BackMsg/ForwardMsg protobufs over
+``/_stcore/stream``), including fragment-scoped reruns, so the server does
+exactly the work a real client would cause.
+
+Per level it reports reruns per second, rerun latency percentiles (send to
+``script_finished``) per action, errors, and the server's resident memory
+per open session. The client side is one asyncio loop; watch its CPU when
+pushing into the hundreds of sessions.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stub_translate import StubTranslationServer  # noqa: E402
+
+DONE = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+        ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY)
+
+# Relative weights of what a simulated learner does next
+ACTIONS = {"navigate": 3, "translate": 2, "quiz": 2, "chat": 3}
+PAGES = ["Home", "Lessons", "Search", "Translator", "Quiz", "Review", "Chatbot", "Progress", "Export"]
+PHRASES = ["Good evening", "Where is the train station?", "I would like a coffee", "How much does it cost?",
+           "My name is Anna", "Thank you very much", "See you tomorrow", "I am learning German"]
+CHAT = ["Hallo!", "Wie geht's?", "Woher kommst du?", "Ich lerne Deutsch", "Was ist dein Hobby?",
+        "Danke für die Hilfe", "Deutsch ist schwer", "Tschüss"]
+
+
+class Widget:
+    __slots__ = ("kind", "id", "label", "options", "fragment_id")
+
+    def __init__(self, kind, proto, fragment_id):
+        self.kind = kind
+        self.id = proto.id
+        self.label = proto.label
+        self.options = list(getattr(proto, "options", []))
+        self.fragment_id = fragment_id
+
+
+class Session:
+    """One simulated browser tab."""
+
+    def __init__(self, url: str, rng: random.Random):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self.query_string = ""
+        self.widgets = {}        # delta path -> Widget, as of the latest run
+        self.states = {}         # widget id -> WidgetState the "browser" keeps sending
+        self.page = "Home"
+        self.errors = 0
+
+    async def connect(self) -> float:
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        return await self.rerun()
+
+    async def close(self) -> None:
+        await self.ws.close()
+
+    async def rerun(self, trigger=None, fragment_id: str = "") -> float:
+        # Send one rerun request and wait until the script (or fragment) has finished
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = self.query_string
+        state.fragment_id = fragment_id
+        state.widget_states.widgets.extend(self.states.values())
+        if trigger is not None:
+            state.widget_states.widgets.append(trigger)
+        if not fragment_id:
+            self.widgets.clear()
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await self.ws.recv())
+            kind = fm.WhichOneof("type")
+            if kind == "delta":
+                self._on_delta(fm)
+            elif kind == "page_info_changed":
+                self.query_string = fm.page_info_changed.query_string
+            elif kind == "script_finished" and fm.script_finished in DONE:
+                return time.perf_counter() - start
+
+    def _on_delta(self, fm) -> None:
+        delta = fm.delta
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+            return
+        proto = getattr(element, kind)
+        if getattr(proto, "id", ""):
+            self.widgets[tuple(fm.metadata.delta_path)] = Widget(kind, proto, delta.fragment_id)
+
+    def find(self, kind: str, label: str) -> Widget:
+        for widget in self.widgets.values():
+            if widget.kind == kind and widget.label == label:
+                return widget
+        raise LookupError(f"no {kind} labelled {label!r} on {self.page}")
+
+    def find_prefix(self, kind: str, prefix: str) -> list:
+        return [w for w in self.widgets.values() if w.kind == kind and w.label.startswith(prefix)]
+
+    # ---------- Interactions ----------
+    def set_string(self, widget: Widget, value: str) -> None:
+        state = WidgetState(id=widget.id, string_value=value)
+        self.states[widget.id] = state
+
+    async def click(self, widget: Widget) -> float:
+        return await self.rerun(WidgetState(id=widget.id, trigger_value=True), widget.fragment_id)
+
+    async def navigate(self, page: str) -> float:
+        self.page = page
+        self.set_string(self.find("selectbox", "Navigate"), page)
+        return await self.rerun()
+
+    async def translate(self, record) -> None:
+        if self.page != "Translator":
+            record("navigate", await self.navigate("Translator"))
+        self.set_string(self.find("text_input", "Enter text to translate"), self.rng.choice(PHRASES))
+        record("translate", await self.click(self.find("button", "Translate")))
+
+    async def quiz(self, record) -> None:
+        if self.page != "Quiz":
+            record("navigate", await self.navigate("Quiz"))
+            choose = self.find("selectbox", "Choose a quiz:")
+            self.set_string(choose, self.rng.choice(choose.options))
+            record("quiz_select", await self.rerun())
+        radio = self.rng.choice(self.find_prefix("radio", "Choose your answer"))
+        self.set_string(radio, self.rng.choice(radio.options))
+        number = radio.label.split("Q")[-1].rstrip(":")
+        record("quiz_submit", await self.click(self.find("button", f"Submit Q{number}")))
+
+    async def chat(self, record) -> None:
+        if self.page != "Chatbot":
+            record("navigate", await self.navigate("Chatbot"))
+        self.set_string(self.find("text_input", "You:"), self.rng.choice(CHAT))
+        record("chat_send", await self.click(self.find("button", "Send")))
+
+    async def act(self, record) -> None:
+        action = self.rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        if action == "navigate":
+            record("navigate", await self.navigate(self.rng.choice(PAGES)))
+        else:
+            await getattr(self, action)(record)
+
+
+# ---------- Server ----------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(port: int, env: dict) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "streamlit", "run", str(ROOT / "main.py"), "--server.headless", "true",
+           "--server.port", str(port), "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, **env},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("app did not come up within 60 s")
+
+
+def rss_bytes(pid: int):
+    # Resident set size from /proc (Linux); None elsewhere
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+# ---------- Load levels ----------
+async def run_level(url: str, sessions: int, duration: float, think_time: float, seed: int, pid: int) -> dict:
+    latencies = defaultdict(list)
+    failures = []
+    rss_before = rss_bytes(pid)
+
+    def record(action, seconds):
+        latencies[action].append(seconds)
+
+    async def learner(i, stop_at):
+        session = Session(url, random.Random(seed * 100003 + i))
+        try:
+            record("connect", await session.connect())
+            while time.monotonic() < stop_at:
+                await asyncio.sleep(session.rng.expovariate(1 / think_time) if think_time else 0)
+                await session.act(record)
+        except Exception as e:
+            failures.append(f"{type(e).__name__}: {e}")
+        finally:
+            if session.ws is not None:
+                await session.close()
+        return session
+
+    started = time.monotonic()
+    tasks = [asyncio.create_task(learner(i, started + duration)) for i in range(sessions)]
+    # Sample memory while every session is still open
+    await asyncio.sleep(min(duration * 0.9, max(duration - 1, 0)))
+    rss_loaded = rss_bytes(pid)
+    done = await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    reruns = sum(len(v) for k, v in latencies.items() if k != "connect")
+    everything = sorted(s for k, v in latencies.items() if k != "connect" for s in v)
+    level = {
+        "sessions": sessions,
+        "seconds": round(elapsed, 2),
+        "reruns": reruns,
+        "reruns_per_second": round(reruns / elapsed, 2),
+        "latency_ms": percentiles(everything),
+        "by_action": {action: {"count": len(v), **percentiles(sorted(v))} for action, v in sorted(latencies.items())},
+        "app_exceptions": sum(s.errors for s in done),
+        "session_failures": len(failures),
+        "failure_samples": failures[:5],
+        "rss_mb": round(rss_loaded / 2 ** 20, 1) if rss_loaded else None,
+        "rss_per_session_kb": round((rss_loaded - rss_before) / sessions / 1024, 1)
+        if rss_loaded and rss_before else None,
+    }
+    return level
+
+
+async def warm_up(url: str) -> None:
+    # Visit every page once so lazy imports and caches don't land on the first level's numbers
+    session = Session(url, random.Random(0))
+    await session.connect()
+    for page in PAGES:
+        await session.navigate(page)
+    await session.close()
+
+
+def percentiles(values) -> dict:
+    if not values:
+        return {}
+
+    def pick(q):
+        return round(values[min(len(values) - 1, int(len(values) * q))] * 1000, 2)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(values[-1] * 1000, 2),
+            "mean": round(statistics.fmean(values) * 1000, 2)}
+
+
+def print_level(level: dict) -> None:
+    lat = level["latency_ms"]
+    print(f"{level['sessions']:>8}{level['reruns_per_second']:>10.1f}{lat.get('p50', 0):>9.1f}{lat.get('p95', 0):>9.1f}"
+          f"{lat.get('p99', 0):>9.1f}{level['app_exceptions'] + level['session_failures']:>8}"
+          f"{level['rss_mb'] or 0:>9.1f}{level['rss_per_session_kb'] or 0:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10,25", help="comma-separated session counts")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per level")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean seconds between actions")
+    parser.add_argument("--stub-latency", type=float, default=0.2, help="seconds per upstream response")
+    parser.add_argument("--stub-error-rate", type=float, default=0.05, help="share of upstream calls failing")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="load_test.json")
+    args = parser.parse_args()
+    levels = [int(n) for n in args.sessions.split(",") if n.strip()]
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubTranslationServer(latency=args.stub_latency, error_rate=args.stub_error_rate, seed=args.seed) as stub:
+        app = start_app(port, {
+            "LINGO_LIBRETRANSLATE_URL": stub.url,
+            "LINGO_MYMEMORY_URL": stub.url,
+            "LINGO_TRANSLATE_PROVIDERS": "libretranslate,mymemory",
+            "LINGO_LOCAL_MODEL_DIR": "",
+            "LINGO_CACHE_DB": str(Path(tmp) / "translation_memory.sqlite3"),
+            "LINGO_PROGRESS_DB": str(Path(tmp) / "progress.sqlite3"),
+            "LINGO_CHAT_SPILL_DIR": "",
+        })
+        try:
+            url = f"ws://127.0.0.1:{port}/_stcore/stream"
+            asyncio.run(warm_up(url))
+            results = []
+            print(f"{'sessions':>8}{'reruns/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+                  f"{'rss MB':>9}{'KB/session':>11}")
+            for sessions in levels:
+                level = asyncio.run(run_level(url, sessions, args.duration, args.think_time, args.seed, app.pid))
+                print_level(level)
+                results.append(level)
+        finally:
+            app.terminate()
+            app.wait(timeout=10)
+
+        report = {
+            "meta": {
+                "duration_s": args.duration,
+                "think_time_s": args.think_time,
+                "stub_latency_s": args.stub_latency,
+                "stub_error_rate": args.stub_error_rate,
+                "stub_requests": stub.requests,
+                "stub_errors": stub.errors,
+                "actions": ACTIONS,
+            },
+            "levels": results,
+        }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Write a tiny, randomly initialised MarianMT model pair for local testing.
+
+    python tools/make_tiny_marian.py /tmp/tiny-marian
+    LINGO_LOCAL_MODEL_DIR=/tmp/tiny-marian streamlit run main.py
+
+The output is gibberish, but it exercises the whole local-model path
+(lazy loading, quantization, micro-batching) in a couple of seconds.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from tokenizers import Tokenizer, models, pre_tokenizers
+from transformers import MarianConfig, MarianMTModel, PreTrainedTokenizerFast
+
+ROOT = Path(__file__).resolve().parent.parent
+SPECIAL = ["<pad>", "</s>", "<unk>"]
+
+
+def build_tokenizer(words):
+    vocab = {tok: i for i, tok in enumerate(SPECIAL + sorted(words))}
+    tok = Tokenizer(models.WordLevel(vocab=vocab, unk_token="<unk>"))
+    tok.pre_tokenizer = pre_tokenizers.Whitespace()
+    return PreTrainedTokenizerFast(tokenizer_object=tok, pad_token="<pad>", eos_token="</s>", unk_token="<unk>")
+
+
+def build_model(vocab_size):
+    config = MarianConfig(
+        vocab_size=vocab_size, decoder_vocab_size=vocab_size,
+        d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2,
+        encoder_ffn_dim=32, decoder_ffn_dim=32, max_position_embeddings=256,
+        pad_token_id=0, eos_token_id=1, decoder_start_token_id=0,
+    )
+    return MarianMTModel(config).eval()
+
+
+def main(out_dir):
+    with open(ROOT / "lessons.json", "r", encoding="utf-8") as f:
+        lessons = json.load(f)
+    words = set()
+    for lesson in lessons:
+        for item in lesson.get("content", []):
+            words.update(item["en"].split())
+            words.update(item["de"].split())
+    tokenizer = build_tokenizer(words)
+    for direction in ("en-de", "de-en"):
+        path = Path(out_dir) / direction
+        tokenizer.save_pretrained(path)
+        build_model(len(tokenizer)).save_pretrained(path)
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "tiny-marian")
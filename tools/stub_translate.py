@@ -0,0 +1,133 @@
+"""Local stand-in for the LibreTranslate and MyMemory APIs.
+
+    python tools/stub_translate.py [--port 5005] [--latency 0.05] [--error-rate 0.1]
+
+Serves ``POST /translate`` (LibreTranslate) and ``GET /get`` (MyMemory)
+from one port, so both LINGO_LIBRETRANSLATE_URL and LINGO_MYMEMORY_URL can
+point at it. Translations are deterministic (``"[de] <text>"``, or a known
+lesson translation when ``pairs`` is given); latency and the share of
+failed requests (HTTP 503) are configurable. Benchmarks start it in-process::
+
+    with StubTranslationServer(latency=0.01) as stub:
+        os.environ["LINGO_LIBRETRANSLATE_URL"] = stub.url
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class StubTranslationServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, pairs: Optional[Dict[Tuple[str, str], str]] = None, seed: int = 0):
+        self.latency = latency            # seconds added to every response
+        self.error_rate = error_rate      # share of requests answered with HTTP 503
+        self.pairs = pairs or {}          # (text, target) -> translation
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def translate(self, text: str, target: str) -> str:
+        return self.pairs.get((text, target)) or f"[{target}] {text}"
+
+    def _fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+        return failed
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"      # keep-alive, like the real APIs
+            disable_nagle_algorithm = True      # else delayed ACKs add ~40 ms per reused connection
+
+            def _reply(self, status: int, body: dict) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if urlparse(self.path).path != "/translate":
+                    return self._reply(404, {"error": "not found"})
+                if stub._fail():
+                    return self._reply(503, {"error": "stub failure"})
+                self._reply(200, {"translatedText": stub.translate(payload.get("q", ""), payload.get("target", "de"))})
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if url.path != "/get":
+                    return self._reply(404, {"error": "not found"})
+                if stub._fail():
+                    return self._reply(503, {"responseStatus": 503})
+                query = parse_qs(url.query)
+                text = query.get("q", [""])[0]
+                target = query.get("langpair", ["en|de"])[0].split("|")[-1]
+                self._reply(200, {"responseStatus": 200, "responseData": {"translatedText": stub.translate(text, target)}})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubTranslationServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-translate", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubTranslationServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with HTTP 503")
+    args = parser.parse_args()
+    stub = StubTranslationServer(args.host, args.port, args.latency, args.error_rate)
+    print(f"stub translation server on {stub.url}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Two-tier translation cache: a bounded in-process LRU in front of a
+persistent SQLite translation memory shared by every session."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import metrics
+import settings
+
+
+def normalize_key(text: str) -> str:
+    # "  Guten   Morgen " and "guten morgen" share one cache entry
+    return " ".join(text.split()).casefold()
+
+
+def lang_pair(target: str) -> str:
+    return "en|de" if target == "de" else "de|en"
+
+
+# ---------- Tier 1: in-process LRU ----------
+class LRUCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[tuple, tuple]" = OrderedDict()   # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: str, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ---------- Tier 2: SQLite translation memory ----------
+class TranslationMemory:
+    PRUNE_EVERY = 256   # writes between expiry/size sweeps
+
+    def __init__(self, path: Path, ttl: float, max_rows: int):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS translations (
+                   pair TEXT NOT NULL,
+                   text_key TEXT NOT NULL,
+                   translation TEXT NOT NULL,
+                   created_at REAL NOT NULL,
+                   PRIMARY KEY (pair, text_key)
+               )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS translations_created ON translations(created_at)")
+
+    def get(self, pair: str, text_key: str) -> Optional[tuple]:
+        # Returns (translation, remaining_ttl) so the LRU entry expires together with the row
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation, created_at FROM translations WHERE pair = ? AND text_key = ?",
+                (pair, text_key),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        remaining = row[1] + self.ttl - time.time()
+        if remaining <= 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0], remaining
+
+    def put(self, pair: str, text_key: str, translation: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (pair, text_key, translation, created_at) VALUES (?, ?, ?, ?)",
+                (pair, text_key, translation, time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune_locked()
+
+    def prune(self) -> None:
+        with self._lock:
+            self._prune_locked()
+
+    def _prune_locked(self) -> None:
+        self._conn.execute("DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        if count > self.max_rows:
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN "
+                "(SELECT rowid FROM translations ORDER BY created_at LIMIT ?)",
+                (count - self.max_rows,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+
+# ---------- Combined cache ----------
+class TranslationCache:
+    def __init__(self, max_entries: int = settings.CACHE_MAX_ENTRIES,
+                 ttl: float = settings.CACHE_TTL_SECONDS,
+                 db_path: Optional[Path] = settings.CACHE_DB_PATH,
+                 db_max_rows: int = settings.CACHE_DB_MAX_ROWS):
+        self.memory = LRUCache(max_entries, ttl)
+        self.disk = TranslationMemory(db_path, ttl, db_max_rows) if db_path else None
+
+    def get(self, text: str, target: str) -> Optional[str]:
+        pair, text_key = lang_pair(target), normalize_key(text)
+        value = self.memory.get((pair, text_key))
+        if value is not None or self.disk is None:
+            return value
+        row = self.disk.get(pair, text_key)
+        if row is None:
+            return None
+        value, remaining = row
+        self.memory.put((pair, text_key), value, ttl=remaining)   # promote to tier 1
+        return value
+
+    def put(self, text: str, target: str, translation: str) -> None:
+        pair, text_key = lang_pair(target), normalize_key(text)
+        self.memory.put((pair, text_key), translation)
+        if self.disk is not None:
+            self.disk.put(pair, text_key, translation)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self.memory),
+            "memory_hits": self.memory.hits,
+            "memory_misses": self.memory.misses,
+            "memory_evictions": self.memory.evictions,
+            "disk_entries": len(self.disk) if self.disk else 0,
+            "disk_hits": self.disk.hits if self.disk else 0,
+            "disk_misses": self.disk.misses if self.disk else 0,
+        }
+
+
+_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    # One cache per process, shared by every Streamlit session
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranslationCache()
+                metrics.register_collector(_collect_metrics)
+    return _cache
+
+
+def _collect_metrics() -> list:
+    stats = _cache.stats()
+    return [
+        ("lingo_translation_cache_hits_total", "counter", "Translation cache hits by tier.",
+         [({"tier": "memory"}, stats["memory_hits"]), ({"tier": "disk"}, stats["disk_hits"])]),
+        ("lingo_translation_cache_misses_total", "counter", "Translation cache misses by tier.",
+         [({"tier": "memory"}, stats["memory_misses"]), ({"tier": "disk"}, stats["disk_misses"])]),
+        ("lingo_translation_cache_entries", "gauge", "Translations held by each cache tier.",
+         [({"tier": "memory"}, stats["memory_entries"]), ({"tier": "disk"}, stats["disk_entries"])]),
+    ]
@@ -0,0 +1,174 @@
+"""Translation pipeline shared by the UI and the batch tools:
+local glossary -> cache -> remote providers (raced) -> local model -> piecewise glossary.
+
+Without an explicit provider, all healthy remote providers are raced
+concurrently and the first valid answer wins; the request never waits
+longer than its latency budget, whatever the individual timeouts are.
+Batch work tries them one at a time in the configured order instead, so
+each phrase costs a single provider's rate and quota.
+Provider calls are admitted by the shared scheduler (rate, quota, priority)
+and identical requests in flight at the same time share one call.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional, Sequence, Tuple
+
+import metrics
+import providers
+import scheduler
+import settings
+from glossary import get_glossary
+from translation_cache import get_translation_cache
+
+NOT_FOUND = "Translation not found in local dictionary"
+
+
+# ---------- Provider calls ----------
+def _record_error(name: str, e: Exception) -> None:
+    if isinstance(e, providers.QuotaExceeded):
+        scheduler.quota_exceeded(name)
+    if isinstance(e, providers.ProviderThrottled):
+        outcome = "throttled"
+    else:
+        outcome = "unavailable" if isinstance(e, providers.ProviderUnavailable) else "error"
+    metrics.inc(metrics.PROVIDER_CALLS, provider=name, outcome=outcome)
+    metrics.inc(metrics.PROVIDER_ERRORS, provider=name, error=type(e).__name__)
+    metrics.log_event("provider_error", provider=name, error=type(e).__name__, message=str(e))
+
+
+def call_provider(name: str, text: str, target: str, priority: str = scheduler.INTERACTIVE,
+                  admitted: bool = False) -> str:
+    # One provider call, timed and counted; errors are recorded and re-raised.
+    # admitted: the scheduler already let this call through (see race_providers)
+    with metrics.span("provider", provider=name):
+        try:
+            if not admitted:
+                scheduler.admit(name, text, priority)
+            translated = providers.PROVIDERS[name](text, target)
+        except Exception as e:
+            _record_error(name, e)
+            raise
+    metrics.inc(metrics.PROVIDER_CALLS, provider=name, outcome="ok")
+    return translated
+
+
+def _admit(name: str, text: str, priority: str) -> bool:
+    try:
+        scheduler.admit(name, text, priority)
+    except providers.ProviderThrottled as e:
+        _record_error(name, e)
+        return False
+    return True
+
+
+# ---------- Provider racing ----------
+# Interactive and batch calls run on separate threads, so batch work waiting on
+# a slow or rate-limited provider never delays someone waiting on an answer
+_pool = ThreadPoolExecutor(max_workers=settings.TRANSLATE_MAX_WORKERS, thread_name_prefix="translate")
+_batch_pool = ThreadPoolExecutor(max_workers=settings.TRANSLATE_BATCH_MAX_WORKERS, thread_name_prefix="translate-batch")
+
+
+def race_providers(text: str, target: str, names: Sequence[str], budget: float,
+                   priority: str = scheduler.INTERACTIVE) -> Optional[str]:
+    # First successful provider wins; losers are cancelled if still queued, ignored otherwise
+    if priority == scheduler.BATCH:
+        # Batch work waits for its rate tokens on the caller's own thread, before the budget starts
+        names = [name for name in names if _admit(name, text, priority)]
+        pool, admitted = _batch_pool, True
+    else:
+        pool, admitted = _pool, False
+    deadline = time.monotonic() + budget
+    pending = {pool.submit(call_provider, name, text, target, priority, admitted) for name in names}
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        return None
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def translate(text: str, target: str = "de", provider: Optional[str] = None,
+              budget: Optional[float] = None, priority: str = scheduler.INTERACTIVE) -> str:
+    # priority: scheduler.INTERACTIVE for someone waiting on the answer, scheduler.BATCH for bulk work
+    text = text.strip()
+    if not text:
+        return ""
+    with metrics.span("translate"):
+        translated, source = _translate(text, target, provider, budget, priority)
+    metrics.inc(metrics.TRANSLATIONS, source=source)
+    return translated
+
+
+def _translate(text: str, target: str, provider: Optional[str], budget: Optional[float],
+               priority: str) -> Tuple[str, str]:
+    # (translation, pipeline stage that produced it)
+    # Exact glossary hit: no network at all
+    glossary = get_glossary()
+    known = glossary.lookup(text, target)
+    if known is not None:
+        return known, "glossary"
+    cache = get_translation_cache()
+    cached = cache.get(text, target)
+    if cached is not None:
+        return cached, "cache"
+    # Remote providers; open circuits are skipped so they cost nothing
+    names = [provider] if provider else settings.TRANSLATE_PROVIDERS
+    names = [name for name in names if name in providers.PROVIDERS]
+    healthy = [name for name in names if providers.client.is_healthy(name)]
+    if len(healthy) < len(names) and metrics.enabled:
+        for name in names:
+            if name not in healthy:
+                metrics.inc(metrics.PROVIDER_CALLS, provider=name, outcome="circuit_open")
+    budget = settings.TRANSLATE_BUDGET_SECONDS if budget is None else budget
+    # Sessions asking for the same translation at the same time share one upstream call;
+    # None when no provider answered in time (or the shared call outlasted the budget)
+    translated = scheduler.coalesce((text, target, tuple(healthy)), _call_providers, text, target, healthy,
+                                    budget, priority, timeout=budget if priority == scheduler.INTERACTIVE else None)
+    if not translated and "local" in providers.PROVIDERS and "local" not in healthy:
+        translated = _degrade_local(text, target, priority)
+    if translated:
+        return translated, "provider"
+    # Every provider failed or ran out of budget: translate known phrases piecewise
+    partial, coverage = glossary.translate(text, target)
+    return (partial, "glossary_partial") if coverage > 0 else (NOT_FOUND, "not_found")
+
+
+def try_in_order(text: str, target: str, names: Sequence[str], budget: float,
+                 priority: str = scheduler.BATCH) -> Optional[str]:
+    # One provider at a time, moving on only when it fails, is throttled or outlasts the budget
+    for name in names:
+        translated = race_providers(text, target, [name], budget, priority)
+        if translated:
+            return translated
+    return None
+
+
+def _call_providers(text: str, target: str, names: Sequence[str], budget: float, priority: str) -> Optional[str]:
+    # Interactive requests race; batch work spends one provider's rate and quota per phrase.
+    # Even a single provider goes through the race, so the budget bounds every call
+    if priority == scheduler.BATCH:
+        translated = try_in_order(text, target, names, budget, priority)
+    else:
+        translated = race_providers(text, target, names, budget, priority) if names else None
+    if translated:
+        get_translation_cache().put(text, target, translated)
+    return translated
+
+
+def _degrade_local(text: str, target: str, priority: str) -> Optional[str]:
+    # Remote providers throttled, failing or out of time: the local model, if there is one
+    try:
+        translated = call_provider("local", text, target, priority)
+    except providers.ProviderError:
+        return None
+    metrics.inc(metrics.SCHEDULER, outcome="degraded_local", priority=priority)
+    get_translation_cache().put(text, target, translated)
+    return translated
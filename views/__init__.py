@@ -0,0 +1,26 @@
+"""App pages, one module per page, each exposing ``render()``.
+
+main.py imports only the module of the page being shown, so a session that
+never opens the Translator never pays for the HTTP client stack, and so on.
+"""
+
+import importlib
+
+import metrics
+
+PAGES = {
+    "Home": "views.home",
+    "Lessons": "views.lessons",
+    "Search": "views.search",
+    "Translator": "views.translate",
+    "Quiz": "views.quiz",
+    "Review": "views.review",
+    "Chatbot": "views.chat",
+    "Progress": "views.progress",
+    "Export": "views.export",
+}
+
+
+def render(page: str) -> None:
+    with metrics.span("page", page=page):
+        importlib.import_module(PAGES[page]).render()
@@ -0,0 +1,89 @@
+import uuid
+from pathlib import Path
+
+import streamlit as st
+
+import chatbot
+import settings
+from chat_history import BOT, ChatHistory
+from fragments import fragment, rerun_fragment
+
+# Comprehensive rule-based responses in German (no external model needed);
+# intents are compiled once per process from chat_intents.json
+get_german_response = chatbot.get_german_response
+
+
+# History, input form and starters rerun as one fragment; the page header doesn't
+@fragment
+def chat_panel():
+    history = st.session_state.chat_history
+
+    # Only the most recent window is rendered, as a single block
+    if history.total() > st.session_state.chat_window:
+        if st.button("⬆️ Load earlier messages"):
+            st.session_state.chat_window += settings.CHAT_WINDOW
+            rerun_fragment()
+    turns = history.window(st.session_state.chat_window)
+    if turns:
+        st.markdown("\n\n".join(
+            f"**{'Bot' if turn.role == BOT else 'You'}:** {turn.text}" for turn in turns
+        ))
+
+    # User input at the bottom
+    with st.form("chat_form", clear_on_submit=True):
+        user_input = st.text_input("You:", key=f"chat_input_{st.session_state.chat_input_key}")
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            submitted = st.form_submit_button("Send")
+        with col2:
+            clear_chat = st.form_submit_button("Clear Chat")
+
+    if submitted and user_input.strip():
+        # Append user message and bot reply
+        bot_reply = get_german_response(user_input)
+        history.add_exchange(user_input, bot_reply)
+        st.session_state.chat_window = settings.CHAT_WINDOW
+        # Increment the key to reset the text input
+        st.session_state.chat_input_key += 1
+        rerun_fragment()
+
+    if clear_chat:
+        history.clear()
+        st.session_state.chat_window = settings.CHAT_WINDOW
+        st.session_state.chat_input_key += 1
+        rerun_fragment()
+
+    # Add some conversation starters
+    st.write("---")
+    st.write("**Konversationsstarter:**")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("Hallo! Wie geht's?"):
+            history.add_exchange("Hallo! Wie geht's?", "Hallo! Mir geht es gut, danke! Und dir?")
+            rerun_fragment()
+    with col2:
+        if st.button("Was machst du?"):
+            history.add_exchange("Was machst du?", "Ich helfe Menschen, Deutsch zu lernen! Und du?")
+            rerun_fragment()
+    with col3:
+        if st.button("Danke für die Hilfe"):
+            history.add_exchange("Danke für die Hilfe", "Gern geschehen! Viel Erfolg beim Deutschlernen!")
+            rerun_fragment()
+
+
+def render():
+    st.header("🤖 German Chatbot")
+    st.write("Chatte mit einem freundlichen deutschen Sprachassistenten")
+
+    # Initialize chat state
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    if "chat_history" not in st.session_state:
+        spill = Path(settings.CHAT_SPILL_DIR) / f"{st.session_state.session_id}.jsonl" if settings.CHAT_SPILL_DIR else None
+        st.session_state.chat_history = ChatHistory(spill_path=spill)   # bounded ring buffer of turns
+    if "chat_input_key" not in st.session_state:
+        st.session_state.chat_input_key = 0
+    if "chat_window" not in st.session_state:
+        st.session_state.chat_window = settings.CHAT_WINDOW   # turns currently rendered
+
+    chat_panel()
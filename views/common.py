@@ -0,0 +1,22 @@
+import datetime
+
+import streamlit as st
+
+import settings
+
+
+def fmt_date(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
+
+
+def paginate(count: int, key: str, page_size: int = settings.LESSONS_PAGE_SIZE) -> range:
+    # Page picker for long lists; returns the positions on the page being shown.
+    # A number input costs the same however many pages there are.
+    pages = max(1, -(-count // page_size))
+    page = 1
+    if pages > 1:
+        if st.session_state.get(key, 1) > pages:
+            st.session_state[key] = pages      # the catalog shrank under us
+        page = st.number_input(f"Page (1–{pages})", min_value=1, max_value=pages, step=1, key=key)
+    start = (page - 1) * page_size
+    return range(start, min(count, start + page_size))
@@ -0,0 +1,143 @@
+import datetime
+import json
+
+import streamlit as st
+
+from content import get_content
+from progress_store import get_progress_store
+
+
+def render():
+    content = get_content()
+    total_lessons = len(content.lesson_catalog)
+    lesson_titles = content.lesson_titles
+    progress = st.session_state.progress
+    progress_store = get_progress_store()
+
+    st.header("📤 Export / Import Progress")
+
+    # Export section
+    st.subheader("Export Your Progress")
+    st.write("Download your learning progress to backup or transfer it to another device.")
+
+    # Create progress data with additional metadata
+    export_data = {
+        "version": "1.1",
+        "export_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_lessons": total_lessons,
+        "completed_lessons": len(progress.completed),
+        "completed": list(progress.completed),
+        "completed_at": {str(k): v for k, v in progress.completed.items()},
+        "quiz_scores": {str(k): {"score": s, "total": t, "taken_at": ts} for k, (s, t, ts) in progress.quiz_scores.items()},
+    }
+
+    # Download button
+    st.download_button(
+        "📥 Download Progress (JSON)",
+        json.dumps(export_data, indent=2, ensure_ascii=False),
+        file_name=f"german_learning_progress_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json",
+        help="Download your complete learning progress as a JSON file"
+    )
+
+    # Display current progress stats
+    st.write("---")
+    st.subheader("Current Progress Overview")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Total Lessons", total_lessons)
+
+    with col2:
+        st.metric("Completed", len(progress.completed))
+
+    with col3:
+        completion_rate = (len(progress.completed) / total_lessons) * 100 if total_lessons else 0
+        st.metric("Completion Rate", f"{completion_rate:.1f}%")
+
+    # Show completed lessons with names
+    if progress.completed:
+        st.write("**Completed Lessons:**")
+        for lesson_id in sorted(progress.completed):
+            title = lesson_titles.get(lesson_id)
+            if title:
+                st.write(f"✅ Lesson {lesson_id}: {title}")
+    else:
+        st.info("No lessons completed yet. Complete some lessons to see your progress here!")
+
+    st.write("---")
+
+    # Import section
+    st.subheader("Import Progress")
+    st.write("Upload a previously exported progress file to restore your learning progress.")
+
+    uploaded = st.file_uploader(
+        "Choose a progress JSON file",
+        type=["json"],
+        help="Select a progress.json file that you previously exported from this app"
+    )
+
+    # The upload stays in the widget after the rerun below, so import each file only once
+    if uploaded and st.session_state.get("_imported_upload") != uploaded.file_id:
+        st.session_state._imported_upload = uploaded.file_id
+        try:
+            # Read and parse the uploaded file
+            data = json.load(uploaded)
+
+            # Validate the file structure
+            if "completed" not in data:
+                st.error("❌ Invalid progress file: 'completed' field not found.")
+            elif not isinstance(data["completed"], list):
+                st.error("❌ Invalid progress file: 'completed' should be a list.")
+            else:
+                # Validate each lesson ID exists (single pass over a prebuilt set)
+                valid_lesson_ids = content.lesson_ids
+                valid_lessons, invalid_lessons = [], []
+                for lesson_id in data["completed"]:
+                    (valid_lessons if lesson_id in valid_lesson_ids else invalid_lessons).append(lesson_id)
+
+                if invalid_lessons:
+                    st.warning(f"⚠️ File contains invalid lesson IDs: {invalid_lessons}. These will be ignored.")
+                # Only keep valid lesson IDs
+                progress_store.replace_completed(progress, valid_lessons)
+
+                # Show import results
+                st.success("✅ Progress imported successfully!")
+
+                # Show import statistics
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.info(f"**Lessons imported:** {len(progress.completed)}")
+                with col2:
+                    st.info(f"**Total available:** {total_lessons}")
+
+                # Show what was imported
+                if progress.completed:
+                    st.write("**Imported lessons:**")
+                    for lesson_id in sorted(progress.completed):
+                        title = lesson_titles.get(lesson_id)
+                        if title:
+                            st.write(f"📘 Lesson {lesson_id}: {title}")
+
+                # Force a rerun to update the UI everywhere
+                st.rerun()
+
+        except json.JSONDecodeError:
+            st.error("❌ Error: The uploaded file is not a valid JSON file.")
+        except Exception as e:
+            st.error(f"❌ An unexpected error occurred: {str(e)}")
+
+    # Reset progress option (with confirmation)
+    st.write("---")
+    st.subheader("Reset Progress")
+
+    if st.button("🔄 Reset All Progress", help="Clear all your completed lessons"):
+        if progress.completed:
+            # Confirm reset
+            if st.checkbox("I understand this will delete all my progress permanently"):
+                if st.button("Confirm Reset"):
+                    progress_store.reset(progress)
+                    st.success("✅ All progress has been reset!")
+                    st.rerun()
+        else:
+            st.info("No progress to reset. You haven't completed any lessons yet.")
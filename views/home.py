@@ -0,0 +1,33 @@
+import streamlit as st
+
+import settings
+from content import get_content
+from render_cache import get_render_cache
+from views.common import fmt_date
+
+
+def render():
+    catalog = get_content().lesson_catalog
+    progress = st.session_state.progress
+
+    st.title("🇩🇪 Lingo Translator — Learn German")
+    st.write("A lightweight learning app with lessons, translator, quizzes and a chatbot.")
+
+    # Progress
+    total = len(catalog)
+    completed = len(progress.completed)
+    pct = progress.percent(total)
+    st.metric("Progress", f"{completed}/{total}", delta=f"{pct}%")
+    st.progress(pct)
+    if progress.last_activity:
+        st.caption(f"Last activity: {fmt_date(progress.last_activity)}")
+
+    st.write("**Available lessons**")
+    shown = min(total, settings.LESSONS_PAGE_SIZE)
+    states = tuple("✅ Completed" if entry.id in progress.completed else None for entry in catalog[:shown])
+    st.markdown(get_render_cache().status_list(0, shown, states))
+    if total > settings.LESSONS_PAGE_SIZE:
+        st.caption(f"…and {total - settings.LESSONS_PAGE_SIZE} more in the Lessons tab.")
+
+    st.write("---")
+    st.info("Tip: Go to the Lessons tab to open a lesson. Mark it complete after practicing.")
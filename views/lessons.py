@@ -0,0 +1,75 @@
+import streamlit as st
+
+import settings
+from content import get_content
+from fragments import fragment
+from progress_store import get_progress_store
+from render_cache import get_render_cache
+from views.common import paginate
+
+
+# Reruns on its own; the lesson list around it is not redrawn
+@fragment
+def lesson_complete_button(lesson_id: int, label: str, key: str, message: str):
+    if st.button(label, key=key):
+        get_progress_store().complete_lessons(st.session_state.progress, [lesson_id])
+        st.success(message)
+
+
+def render():
+    content = get_content()
+    blocks = get_render_cache()
+    catalog = content.lesson_catalog
+
+    # ================== SESSION STATE ==================
+    if "_selected_lesson" not in st.session_state:
+        st.session_state._selected_lesson = None
+
+    # ================== LESSONS PAGE ==================
+    st.header("📚 Lessons")
+
+    # Handle preselection (from Home if needed): open the page that holds it
+    preselected = st.session_state.get("_selected_lesson")
+    position = content.lesson_position(preselected) if preselected is not None else None
+    if position is not None:
+        st.session_state.lesson_page = position // settings.LESSONS_PAGE_SIZE + 1
+
+    # Only the lessons on the current page are loaded and drawn
+    visible = paginate(len(catalog), key="lesson_page")
+    page_entries = catalog[visible.start:visible.stop]
+    page_labels = [content.lesson_id_to_label[entry.id] for entry in page_entries]
+
+    default_index = 0
+    if position is not None:
+        default_index = page_labels.index(content.lesson_id_to_label[preselected]) + 1
+        st.session_state._selected_lesson = None
+
+    # ---- Single lesson dropdown ----
+    sel = st.selectbox(
+        "Select a lesson",
+        ["-- choose --"] + page_labels,
+        index=default_index
+    )
+
+    if sel and sel != "-- choose --":
+        lesson_id = content.lesson_label_to_id[sel]
+        lesson = content.lesson_by_id[lesson_id]
+
+        st.subheader(f"Lesson {lesson_id} — {lesson['title']}")
+        st.caption(f"Practice these {content.item_counts[lesson_id]} words/phrases:")
+
+        # ✅ Show ALL items in lesson (no slicing), as one prebuilt table
+        st.markdown(blocks.lesson_table(lesson_id))
+
+        # Only show "Mark lesson complete" button (quiz button removed)
+        lesson_complete_button(lesson_id, "Mark lesson complete", f"complete_{lesson_id}", "Lesson marked complete ✅")
+
+    st.markdown("---")
+    # ---- Lessons on this page (expanders) ----
+    st.subheader("All lessons" if len(visible) == len(catalog) else f"Lessons {visible.start + 1}–{visible.stop} of {len(catalog)}")
+    for entry, label in zip(page_entries, page_labels):
+        with st.expander(label):
+            st.markdown(blocks.lesson_table(entry.id))
+
+            # Only show "Mark complete" button (quiz button removed)
+            lesson_complete_button(entry.id, "Mark complete", f"exp_complete_{entry.id}", "Marked complete ✅")
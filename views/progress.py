@@ -0,0 +1,58 @@
+import streamlit as st
+
+from content import GENERATED_QUIZ_BASE, get_content
+from progress_store import get_progress_store
+from render_cache import get_render_cache
+from views.common import fmt_date, paginate
+
+
+def render():
+    content = get_content()
+    catalog = content.lesson_catalog
+    progress = st.session_state.progress
+    progress_store = get_progress_store()
+
+    st.header("📈 Your Progress")
+
+    total = len(catalog)
+    completed = len(progress.completed)
+    pct = progress.percent(total)
+
+    st.metric("Lessons completed", f"{completed}/{total}", delta=f"{pct}%")
+    st.progress(pct)
+
+    st.markdown("---")
+    st.subheader("Lesson Status")
+
+    # Show each lesson on the current page and its status
+    visible = paginate(total, key="progress_page")
+    states = tuple(
+        f"✅ Completed {fmt_date(progress.completed[entry.id])}" if entry.id in progress.completed else None
+        for entry in catalog[visible.start:visible.stop]
+    )
+    st.markdown(get_render_cache().status_list(visible.start, visible.stop, states))
+
+    if progress.quiz_scores:
+        st.markdown("---")
+        st.subheader("Quiz Scores")
+        for quiz_id, (score, quiz_total, taken_at) in sorted(progress.quiz_scores.items()):
+            quiz = content.quiz_by_id.get(quiz_id)
+            lesson_id = quiz_id - GENERATED_QUIZ_BASE
+            if quiz:
+                title = quiz["title"]
+            elif lesson_id in content.lesson_titles:
+                title = f"Lesson {lesson_id}: {content.lesson_titles[lesson_id]} — practice quiz"
+            else:
+                continue
+            st.write(f"**{title}** — {score}/{quiz_total} *({fmt_date(taken_at)})*")
+
+    st.markdown("---")
+    # Reset progress button
+    if st.button("Reset progress"):
+        progress_store.reset(progress)
+        st.success("All lesson progress has been reset.")
+
+    # Mark all lessons complete button
+    if st.button("Mark all lessons as completed"):
+        progress_store.complete_lessons(progress, content.lesson_ids)
+        st.success("All lessons marked as completed ✅")
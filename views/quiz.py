@@ -0,0 +1,100 @@
+import streamlit as st
+
+from content import get_content
+import grading
+from fragments import fragment, rerun_fragment
+from lazy import lazy_import
+from progress_store import get_progress_store
+
+quizgen = lazy_import("quizgen")
+
+
+# Reruns on its own; state is handed back through st.session_state
+@fragment
+def quiz_questions(quiz: dict, typed: bool = False):
+    quiz_id = quiz["quiz_id"]
+    # A generated quiz's variants share a quiz id; fresh widget keys for each
+    prefix = f"{quiz_id}v{quiz['variant']}" if "variant" in quiz else f"{quiz_id}"
+    # question number -> (correct, feedback); kept across reruns so the score counts every answer
+    results = st.session_state.setdefault("quiz_results", {}).setdefault(prefix, {})
+    total = len(quiz["questions"])
+    submitted = False
+
+    for idx, q in enumerate(quiz["questions"], 1):
+        st.write(f"**Q{idx}: {q['question']}**")
+        if typed:
+            answer = st.text_input(f"Type your answer for Q{idx}:", key=f"t{prefix}_{idx}")
+        else:
+            answer = st.radio(
+                f"Choose your answer for Q{idx}:",
+                q["options"],
+                key=f"q{prefix}_{idx}"
+            )
+        if st.button(f"Submit Q{idx}", key=f"{'check' if typed else 'submit'}_{prefix}_{idx}"):
+            submitted = True
+            if typed:
+                result = grading.grade(answer, q["answer"], q.get("accepted", ()))
+                if result.exact:
+                    results[idx] = (True, "✅ Correct!")
+                elif result.correct:
+                    results[idx] = (True, f"✅ Correct! Watch the spelling: {result.answer}")
+                else:
+                    results[idx] = (False, f"❌ Wrong! Correct answer: {q['answer']}")
+            elif answer == q["answer"]:
+                results[idx] = (True, "✅ Correct!")
+            else:
+                results[idx] = (False, f"❌ Wrong! Correct answer: {q['answer']}")
+        if idx in results:
+            correct, feedback = results[idx]
+            (st.success if correct else st.error)(feedback)
+
+    score = sum(correct for correct, _ in results.values())
+    st.info(f"Your final score: {score}/{total}")
+    if submitted:
+        get_progress_store().record_quiz(st.session_state.progress, quiz_id, score, total)
+    if results and st.button("Start over", key=f"restart_{prefix}"):
+        del st.session_state.quiz_results[prefix]
+        rerun_fragment()
+
+
+def generated_quiz(content):
+    # Practice quiz built from a lesson's words; "New questions" draws another variant
+    lesson_label = st.selectbox("Choose a lesson:", content.lesson_labels, key="quizgen_lesson")
+    lesson_id = content.lesson_label_to_id[lesson_label]
+    seeds = st.session_state.setdefault("quizgen_seeds", {})
+    if st.button("New questions", key="quizgen_new"):
+        seeds[lesson_id] = seeds.get(lesson_id, 0) + 1
+    return quizgen.get_quiz_generator().quiz(lesson_id, seeds.get(lesson_id, 0))
+
+
+def render():
+    content = get_content()
+    st.subheader("📝 Take a Quiz")
+
+    preselected = st.session_state.pop("_selected_quiz", None)
+    if preselected is not None:
+        st.session_state.quiz_source = "Quizzes"
+    source = st.radio("Questions from", ["Quizzes", "Lesson words"], horizontal=True, key="quiz_source")
+    typed = st.radio("Answer by", ["Choosing", "Typing"], horizontal=True, key="quiz_mode") == "Typing"
+    if source == "Lesson words":
+        quiz = generated_quiz(content)
+        if quiz:
+            st.markdown(f"### {quiz['title']}")
+            quiz_questions(quiz, typed)
+        else:
+            st.info("This lesson has no words to quiz yet.")
+        return
+
+    # Create dropdown with all quiz titles; a quiz opened from Search is preselected
+    default_index = 0
+    if preselected in content.quiz_id_to_label:
+        default_index = content.quiz_labels.index(content.quiz_id_to_label[preselected])
+    selected_quiz = st.selectbox("Choose a quiz:", content.quiz_labels, index=default_index)
+
+    # Get the selected quiz object
+    quiz_id = content.quiz_label_to_id[selected_quiz]
+    quiz = content.quiz_by_id.get(quiz_id)
+
+    if quiz:
+        st.markdown(f"### {quiz['title']}")
+        quiz_questions(quiz, typed)
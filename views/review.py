@@ -0,0 +1,73 @@
+import time
+
+import streamlit as st
+
+import review
+from content import get_content
+from fragments import fragment, rerun_fragment
+from progress_store import get_progress_store
+from views.common import fmt_date
+
+GRADES = [("Again", review.AGAIN), ("Hard", review.HARD), ("Good", review.GOOD), ("Easy", review.EASY)]
+
+
+def next_card(deck: review.Deck, content):
+    # Due card with text; cards whose lesson item disappeared are dropped from the deck
+    while True:
+        card = deck.next_due()
+        if card is None:
+            return None, None
+        text = review.card_text(content, card)
+        if text is not None:
+            return card, text
+        deck.remove(card.key)
+
+
+# Reruns on its own: revealing and grading a card doesn't redraw the page
+@fragment
+def review_card():
+    content = get_content()
+    deck = st.session_state.review_deck
+    card, text = next_card(deck, content)
+    if card is None:
+        upcoming = deck.peek()
+        if upcoming is None:
+            st.info("No cards yet — complete a lesson to add its words to your reviews.")
+        else:
+            st.success(f"All caught up! Next review due {fmt_date(upcoming.due)}.")
+        return
+
+    st.caption(f"{deck.due_count()} due · Lesson {card.lesson_id}" + (" · new" if card.is_new else ""))
+    st.markdown(f"### {text['en']}")
+    if not st.session_state.get("review_revealed"):
+        if st.button("Show answer", key="review_show"):
+            st.session_state.review_revealed = True
+            rerun_fragment()
+        return
+
+    st.markdown(f"**{text['de']}**")
+    for column, (label, quality) in zip(st.columns(len(GRADES)), GRADES):
+        if column.button(label, key=f"review_grade_{quality}", width="stretch"):
+            deck.grade(card, quality)
+            get_progress_store().record_review(st.session_state.user_id, card)
+            st.session_state.review_revealed = False
+            rerun_fragment()
+
+
+def render():
+    content = get_content()
+    if "review_deck" not in st.session_state:
+        # Loaded once per session, like progress; grades update it and are queued for the store
+        st.session_state.review_deck = review.load_deck(st.session_state.user_id)
+    deck = st.session_state.review_deck
+    deck.sync(content, st.session_state.progress.completed)
+
+    st.header("🔁 Review")
+    st.caption("Words from your completed lessons come back just before you'd forget them.")
+    now = time.time()
+    cols = st.columns(3)
+    cols[0].metric("Cards", len(deck))
+    cols[1].metric("Due now", deck.due_count(now))
+    cols[2].metric("Learned", deck.learned)
+    st.markdown("---")
+    review_card()
@@ -0,0 +1,50 @@
+import time
+
+import streamlit as st
+
+from content import get_content
+from search import get_search_index
+
+RESULTS = 20
+
+
+def open_lesson(lesson_id: int):
+    # Button callback: runs before the next script run, so the sidebar can still be switched
+    st.session_state._selected_lesson = lesson_id
+    st.session_state.nav_page = "Lessons"
+
+
+def open_quiz(quiz_id: int):
+    st.session_state._selected_quiz = quiz_id
+    st.session_state.nav_page = "Quiz"
+
+
+def render():
+    content = get_content()
+    st.header("🔎 Search")
+    query = st.text_input("Search words, phrases and quiz questions (English or German)", key="search_query",
+                          placeholder="e.g. Bitte, train station, strasse")
+    if not query.strip():
+        st.caption("Umlauts can be typed as ae/oe/ue and ß as ss; small typos are forgiven.")
+        return
+
+    index = get_search_index()
+    start = time.perf_counter()
+    hits = index.search(query, limit=RESULTS)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not hits:
+        st.info(f"No matches for “{query}”.")
+        return
+    st.caption(f"{len(hits)} results in {elapsed:.1f} ms")
+
+    for n, hit in enumerate(hits):
+        left, right = st.columns([5, 1])
+        if hit.kind == "lesson":
+            left.markdown(f"**{hit.text}** → *{hit.detail}*  \n"
+                          f"Lesson {hit.ref}: {content.lesson_titles.get(hit.ref, '')}")
+            right.button("Open lesson", key=f"search_open_{n}", on_click=open_lesson, args=(hit.ref,))
+        else:
+            quiz = content.quiz_by_id.get(hit.ref)
+            left.markdown(f"**{hit.text}** — *{hit.detail}*  \n"
+                          f"Quiz: {quiz['title'] if quiz else hit.ref}")
+            right.button("Open quiz", key=f"search_open_{n}", on_click=open_quiz, args=(hit.ref,))
@@ -0,0 +1,136 @@
+from typing import Iterable, List
+
+import streamlit as st
+
+import settings
+from lazy import lazy_import
+
+# The HTTP client stack (and the local model, if configured) is only imported
+# once something is actually translated; usually the warm-up thread got there first.
+batch = lazy_import("batch")
+document = lazy_import("document")
+local_model = lazy_import("local_model")
+translator = lazy_import("translator")
+
+
+def translate_text(text: str, target: str = "de") -> str:
+    # Local glossary, then the local model and remote providers raced within the latency budget
+    local_model.register_provider()
+    return translator.translate(text, target)
+
+
+def show_block(text: str, markdown: bool) -> None:
+    # Plain text keeps its line breaks
+    st.markdown(text if markdown else text.replace("\n", "  \n"))
+
+
+def render_document(pieces: Iterable[str], markdown: bool,
+                    size: int = settings.DOCUMENT_RENDER_SEGMENTS) -> List[str]:
+    # One element per `size` segments, cut at line ends outside code blocks:
+    # each piece is sent to the browser once, not again with every update.
+    # Returns the blocks as shown.
+    blocks, chunk, in_code = [], [], False
+    for piece in pieces:
+        chunk.append(piece)
+        if markdown and document.is_fence(piece):
+            in_code = not in_code
+        if len(chunk) >= size and piece.endswith("\n") and not in_code:
+            blocks.append("".join(chunk))
+            show_block(blocks[-1], markdown)
+            chunk.clear()
+    if chunk:
+        blocks.append("".join(chunk))
+        show_block(blocks[-1], markdown)
+    return blocks
+
+
+def render():
+    st.header("🔁 Translator")
+
+    # Input text (remember previous input)
+    text_input = st.text_input("Enter text to translate", key="translator_input")
+
+    # Direction
+    lang = st.selectbox("Direction", ["English → German", "German → English"], key="translator_dir")
+    target = "de" if lang.startswith("English") else "en"
+
+    # Button to trigger translation
+    if st.button("Translate"):
+        if not text_input.strip():
+            st.warning("Type something to translate.")
+        else:
+            with st.spinner("Translating..."):
+                translated_text = translate_text(text_input, target)
+                # Store in session_state so result persists after rerun
+                st.session_state.translated_text = translated_text
+
+    # Show translation if available
+    if "translated_text" in st.session_state:
+        st.subheader("Translation:")
+        st.success(st.session_state.translated_text)
+
+    # ---- Batch mode ----
+    st.markdown("---")
+    st.subheader("Batch translation")
+    st.caption("Paste one phrase per line or upload a .txt/.csv file (first column is used).")
+    batch_text = st.text_area("Phrases", key="batch_input", height=150)
+    batch_file = st.file_uploader("Or upload a file", type=["txt", "csv"], key="batch_file")
+
+    if st.button("Translate all"):
+        if batch_file is not None:
+            phrases = batch.parse_phrases(batch_file.getvalue().decode("utf-8", errors="replace"), batch_file.name)
+        else:
+            phrases = batch.parse_phrases(batch_text)
+        if not phrases:
+            st.warning("Add some phrases to translate.")
+        else:
+            progress_bar = st.progress(0, text=f"0/{len(phrases)} translated")
+
+            def on_result(result, done):
+                progress_bar.progress(done / len(phrases), text=f"{done}/{len(phrases)} translated")
+
+            local_model.register_provider()
+            results = batch.translate_batch(phrases, target, on_result=on_result)
+            st.session_state.batch_results = (target, results)
+
+    if "batch_results" in st.session_state:
+        batch_target, results = st.session_state.batch_results
+        st.dataframe([{"text": r.text, "translation": r.translation} for r in results], width="stretch")
+        st.download_button(
+            "📥 Download CSV",
+            batch.results_to_csv(results, batch_target),
+            file_name="translations.csv",
+            mime="text/csv",
+        )
+
+    # ---- Document mode ----
+    st.markdown("---")
+    st.subheader("Document translation")
+    st.caption("Upload a .txt or .md file; the translation appears sentence by sentence as it is ready.")
+    doc_file = st.file_uploader("Document", type=["txt", "md"], key="doc_file")
+
+    translated_now = False
+    if st.button("Translate document", disabled=doc_file is None):
+        local_model.register_provider()
+        doc_file.seek(0)
+        is_markdown = doc_file.name.lower().endswith(".md")
+        with st.container(border=True):
+            blocks = render_document(
+                document.translate_stream(document.iter_lines(doc_file), target, markdown=is_markdown), is_markdown
+            )
+        st.session_state.doc_result = (doc_file.name, target, blocks, is_markdown)
+        translated_now = True
+
+    if "doc_result" in st.session_state:
+        name, doc_target, blocks, is_markdown = st.session_state.doc_result
+        if not translated_now:
+            with st.expander(f"Last translated document: {name}"):
+                for block in blocks:
+                    show_block(block, is_markdown)
+        stem, _, ext = name.rpartition(".")
+        st.download_button(
+            "📥 Download translation",
+            lambda: "".join(blocks),        # joined only when downloaded
+            file_name=f"{stem or name}.{doc_target}.{ext or 'txt'}",
+            mime="text/markdown" if ext.lower() == "md" else "text/plain",
+        )
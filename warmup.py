@@ -0,0 +1,115 @@
+"""Process warm-up: build the shared caches before users need them.
+
+``start()`` runs ``warm_up()`` on a daemon thread, once per process, so the
+first page renders straight away while content, the glossary, the search
+index, the quiz generator's vectors, the chatbot matcher, the caches and
+the translation client stack load behind it.
+``python warmup.py`` runs the same steps in the foreground and prints how
+long each took, which is handy for checking a new image before it serves.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import settings
+
+
+def _content():
+    from content import get_content
+    get_content()
+
+
+def _glossary():
+    from glossary import get_glossary
+    get_glossary()
+
+
+def _search_index():
+    from search import get_search_index
+    get_search_index()
+
+
+def _quiz_generator():
+    from quizgen import get_quiz_generator
+    get_quiz_generator()
+
+
+def _chat_matcher():
+    from chatbot import get_matcher
+    get_matcher()
+
+
+def _translation_cache():
+    from translation_cache import get_translation_cache
+    get_translation_cache()
+
+
+def _progress_store():
+    from progress_store import get_progress_store
+    get_progress_store()
+
+
+def _translator():
+    # The HTTP client stack; the views import it lazily
+    import batch  # noqa: F401
+    import translator  # noqa: F401
+
+
+def _local_model():
+    import local_model
+    local = local_model.get_local_translator()
+    if local is not None:
+        for engine in local.engines.values():
+            engine.load()
+
+
+STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("content", _content),
+    ("glossary", _glossary),
+    ("search_index", _search_index),
+    ("quiz_generator", _quiz_generator),
+    ("chat_matcher", _chat_matcher),
+    ("translation_cache", _translation_cache),
+    ("progress_store", _progress_store),
+    ("translator", _translator),
+]
+
+
+errors: Dict[str, str] = {}     # step -> error of the last run; the app retries those lazily
+
+
+def warm_up(load_local_model: bool = settings.WARMUP_LOCAL_MODEL) -> Dict[str, float]:
+    # Seconds per successful step
+    timings = {}
+    steps = STEPS + [("local_model", _local_model)] if load_local_model else STEPS
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+            continue
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+
+def start() -> threading.Thread:
+    global _thread
+    if _thread is None:
+        with _thread_lock:
+            if _thread is None:
+                _thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+                _thread.start()
+    return _thread
+
+
+if __name__ == "__main__":
+    for name, seconds in warm_up().items():
+        print(f"{name:<20}{seconds * 1000:>10.1f} ms")
+    for name, error in errors.items():
+        print(f"{name:<20}    failed: {error}")